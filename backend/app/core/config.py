@@ -27,16 +27,54 @@ class Settings(BaseSettings):
     
     # AI settings
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
+    OPENAI_API_BASE: str = os.getenv("OPENAI_API_BASE", "https://api.openai.com/v1")
     HUGGINGFACE_API_KEY: str = os.getenv("HUGGINGFACE_API_KEY", "")
     
+    # Generated content deduplication settings
+    CONTENT_INDEX_DIR: str = os.getenv("CONTENT_INDEX_DIR", "data/content_index")
+    CONTENT_SIMILARITY_THRESHOLD: float = float(os.getenv("CONTENT_SIMILARITY_THRESHOLD", 0.8))
+    
+    # Content idea pool settings
+    IDEA_POOL_PATH: str = os.getenv("IDEA_POOL_PATH", "data/idea_pool.json")
+    IDEA_POOL_SIZE: int = int(os.getenv("IDEA_POOL_SIZE", 50))
+    IDEA_POOL_LOW_WATER: int = int(os.getenv("IDEA_POOL_LOW_WATER", 15))
+    IDEA_POOL_BATCH_SIZE: int = int(os.getenv("IDEA_POOL_BATCH_SIZE", 25))
+    IDEA_POOL_TTL: int = int(os.getenv("IDEA_POOL_TTL", 7 * 24 * 3600))  # 1 week
+    
     # Social media API keys
     LINKEDIN_API_KEY: str = os.getenv("LINKEDIN_API_KEY", "")
     FACEBOOK_API_KEY: str = os.getenv("FACEBOOK_API_KEY", "")
     TWITTER_API_KEY: str = os.getenv("TWITTER_API_KEY", "")
     
+    # Logging settings
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json")  # "json" or "text"
+    LOG_FILE: str = os.getenv("LOG_FILE", "")
+    LOG_RATE_LIMIT: float = float(os.getenv("LOG_RATE_LIMIT", 10))  # records/second per call site
+    LOG_RATE_BURST: int = int(os.getenv("LOG_RATE_BURST", 50))
+    LOG_SAMPLE_RATE: float = float(os.getenv("LOG_SAMPLE_RATE", 0.01))  # kept once over the limit
+    
     # Monitoring settings
     MONITORING_INTERVAL: int = int(os.getenv("MONITORING_INTERVAL", 300))  # 5 minutes
     
+    # Model tuning settings
+    MODEL_TUNING_BUDGET: int = int(os.getenv("MODEL_TUNING_BUDGET", 300))  # seconds
+    MODEL_TUNING_JOBS: int = int(os.getenv("MODEL_TUNING_JOBS", -1))  # -1 uses all cores
+    
+    # Leader election settings (background loops run in one process only)
+    LEADER_LOCK_NAME: str = os.getenv("LEADER_LOCK_NAME", "costbyte-background-loops")
+    LEADER_LOCK_FILE: str = os.getenv("LEADER_LOCK_FILE", "data/leader.lock")  # used with SQLite
+    LEADER_RETRY_INTERVAL: float = float(os.getenv("LEADER_RETRY_INTERVAL", 2))  # seconds
+    
+    # Supplier price list import settings
+    PRICE_IMPORT_CHUNK_SIZE: int = int(os.getenv("PRICE_IMPORT_CHUNK_SIZE", 50000))
+    
+    # Analytics export settings
+    ANALYTICS_EXPORT_DIR: str = os.getenv("ANALYTICS_EXPORT_DIR", "data/analytics")
+    ANALYTICS_EXPORT_BATCH_SIZE: int = int(os.getenv("ANALYTICS_EXPORT_BATCH_SIZE", 50000))
+    ANALYTICS_CACHE_WINDOW: int = int(os.getenv("ANALYTICS_CACHE_WINDOW", 300))  # 5 minutes
+    ANALYTICS_COMPACT_THRESHOLD: int = int(os.getenv("ANALYTICS_COMPACT_THRESHOLD", 24))  # files in today's partition
+    
     class Config:
         case_sensitive = True
 
@@ -0,0 +1,216 @@
+# app/core/leader_election.py
+import asyncio
+import logging
+import os
+import zlib
+from typing import Callable, List, Optional
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+from app.core.config import settings
+from app.db.session import engine
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresAdvisoryLock:
+    """Session-level Postgres advisory lock held on a dedicated connection.
+
+    Postgres releases the lock as soon as the holding session ends, so a
+    crashed leader frees it without any timeout. If the leader's host or
+    network goes away instead, nothing closes the session; TCP keepalives
+    on both ends, scaled to ``retry_interval``, make Postgres drop it and
+    the old leader notice within a few retry intervals rather than after
+    the two-hour system default.
+    """
+
+    def __init__(self, key: int, retry_interval: float):
+        self.key = key
+        self._conn = None
+
+        # Probe after two quiet intervals, then every interval, giving up after three
+        self.keepalives_idle = max(1, int(2 * retry_interval))
+        self.keepalives_interval = max(1, int(retry_interval))
+        self.keepalives_count = 3
+        timeout_ms = 1000 * (self.keepalives_idle + self.keepalives_interval * self.keepalives_count)
+        self._engine = create_engine(
+            settings.DATABASE_URL,
+            poolclass=NullPool,
+            connect_args={
+                "keepalives": 1,
+                "keepalives_idle": self.keepalives_idle,
+                "keepalives_interval": self.keepalives_interval,
+                "keepalives_count": self.keepalives_count,
+                # Also fail queries stuck on unacknowledged data, which keepalives do not cover
+                "tcp_user_timeout": timeout_ms,
+            },
+        )
+
+    def acquire(self) -> bool:
+        if self._conn is None:
+            conn = self._engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+            try:
+                # The server-side counterpart: Postgres probes the leader's host
+                # and ends the session, releasing the lock, when it stops answering
+                conn.execute(text(f"SET tcp_keepalives_idle = {self.keepalives_idle}"))
+                conn.execute(text(f"SET tcp_keepalives_interval = {self.keepalives_interval}"))
+                conn.execute(text(f"SET tcp_keepalives_count = {self.keepalives_count}"))
+            except Exception:
+                conn.close()
+                raise
+            self._conn = conn
+        return bool(self._conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}).scalar())
+
+    def is_held(self) -> bool:
+        """The lock lives as long as the session, so check the session is alive"""
+        try:
+            self._conn.execute(text("SELECT 1"))
+            return True
+        except Exception:
+            self._close()
+            return False
+
+    def release(self):
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+        finally:
+            self._close()
+
+    def _close(self):
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+        self._conn = None
+
+
+class FileLock:
+    """Exclusive flock on a local file, used when the database is SQLite.
+
+    The kernel drops the lock when the holding process exits.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def acquire(self) -> bool:
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._file = open(self.path, "a+")
+        try:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+
+        self._file.seek(0)
+        self._file.truncate()
+        self._file.write(str(os.getpid()))
+        self._file.flush()
+        return True
+
+    def is_held(self) -> bool:
+        return self._file is not None
+
+    def release(self):
+        if self._file is None:
+            return
+        try:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._file.close()
+            self._file = None
+
+
+class LeaderElector:
+    """Runs background loops in exactly one process across workers and replicas.
+
+    Every process keeps trying to take the leader lock every
+    ``retry_interval`` seconds. The winner starts the loops returned by
+    ``start_loops`` and checks that it still holds the lock on the same
+    interval. If it loses the lock, it cancels them. The other processes
+    keep serving HTTP and take over when the leader goes away.
+    """
+
+    def __init__(self, start_loops: Callable[[], List[asyncio.Task]], retry_interval: float = None):
+        self.start_loops = start_loops
+        self.retry_interval = retry_interval or settings.LEADER_RETRY_INTERVAL
+        self.is_leader = False
+
+        # Postgres coordinates every replica; a lock file only coordinates
+        # processes sharing a disk, which is all a SQLite database supports
+        dialect = engine.dialect.name
+        if dialect == "postgresql":
+            self._lock = PostgresAdvisoryLock(zlib.crc32(settings.LEADER_LOCK_NAME.encode()), self.retry_interval)
+        elif dialect == "sqlite" and fcntl is not None:
+            self._lock = FileLock(settings.LEADER_LOCK_FILE)
+        else:
+            logger.warning("No leader lock for database dialect %s; every process will run the background loops", dialect)
+            self._lock = None
+
+        self._loops: List[asyncio.Task] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start competing for leadership"""
+        if self._lock is None:
+            # No way to coordinate, so behave like a single process
+            logger.warning("No leader lock available; running background loops here")
+            self._promote()
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the loops and hand leadership to another process"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        await self._demote()
+
+    async def _run(self):
+        while True:
+            try:
+                if not self.is_leader:
+                    if await asyncio.to_thread(self._lock.acquire):
+                        self._promote()
+                elif not await asyncio.to_thread(self._lock.is_held):
+                    logger.warning("Lost leadership, stopping background loops")
+                    await self._demote()
+
+            except Exception as e:
+                logger.error("Leader election error: %s", e)
+                await self._demote()
+
+            await asyncio.sleep(self.retry_interval)
+
+    def _promote(self):
+        self.is_leader = True
+        self._loops = self.start_loops()
+        logger.info("Elected leader (pid %s), started %s background loops", os.getpid(), len(self._loops))
+
+    async def _demote(self):
+        was_leader = self.is_leader
+        self.is_leader = False
+
+        for task in self._loops:
+            task.cancel()
+        await asyncio.gather(*self._loops, return_exceptions=True)
+        self._loops = []
+
+        if self._lock is not None:
+            try:
+                await asyncio.to_thread(self._lock.release)
+            except Exception as e:
+                logger.error("Error releasing leader lock: %s", e)
+
+        if was_leader:
+            logger.info("Stepped down as leader (pid %s)", os.getpid())
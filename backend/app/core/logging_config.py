@@ -0,0 +1,219 @@
+# app/core/logging_config.py
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple, Optional
+from app.core.config import settings
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+# Arguments that cannot change between the logging call and the listener formatting them
+_IMMUTABLE_ARGS = (str, int, float, bool, type(None))
+
+
+class JSONFormatter(logging.Formatter):
+    """Formats records as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.utcfromtimestamp(record.created).isoformat() + "Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+            "thread": record.threadName,
+        }
+
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Rate-limits chatty DEBUG/INFO call sites.
+
+    Each call site (logger, file and line) gets a token bucket of
+    ``burst`` records refilled at ``rate`` per second. Once it is empty, only
+    a ``sample_rate`` fraction of records gets through, and the next record
+    that passes carries the number dropped in ``suppressed``. WARNING and
+    above are never dropped.
+
+    Counts for call sites that went quiet are handed to ``report`` as
+    summary records every ``report_interval`` seconds and on ``flush``.
+    """
+
+    def __init__(self, rate: float, burst: int, sample_rate: float, report_interval: float = 60.0,
+                 report: Optional[Callable[[logging.LogRecord], None]] = None):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.sample_rate = sample_rate
+        self.report_interval = report_interval
+        self.report = report
+        self._buckets: Dict[Tuple[str, str, int], list] = {}
+        self._lock = threading.Lock()
+        self._next_report = time.monotonic() + report_interval
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        now = time.monotonic()
+        if now >= self._next_report:
+            self._next_report = now + self.report_interval
+            self.flush()
+
+        if record.levelno >= logging.WARNING:
+            return True
+
+        # The message itself may be any object, hashable or not
+        key = (record.name, record.pathname, record.lineno)
+        dropped: List[logging.LogRecord] = []
+
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                # Keep memory bounded if call sites are generated dynamically
+                if len(self._buckets) >= 10000:
+                    dropped = self._drain()
+                    self._buckets.clear()
+                # [tokens, last refill, suppressed since last emitted]
+                bucket = self._buckets[key] = [float(self.burst), now, 0]
+
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+            elif random.random() >= self.sample_rate:
+                bucket[2] += 1
+                return False
+
+            if bucket[2]:
+                record.suppressed = bucket[2]
+                bucket[2] = 0
+
+        self._report(dropped)
+        return True
+
+    def flush(self):
+        """Report the records suppressed at call sites that have not logged since"""
+        with self._lock:
+            summaries = self._drain()
+        self._report(summaries)
+
+    def _drain(self) -> List[logging.LogRecord]:
+        """Summary records for pending suppressed counts, resetting them; call with the lock held"""
+        summaries = []
+        for (name, pathname, lineno), bucket in self._buckets.items():
+            if bucket[2]:
+                summary = logging.LogRecord(
+                    name, logging.INFO, pathname, lineno, "Suppressed %d records from this call site",
+                    (bucket[2],), None
+                )
+                summary.suppressed = bucket[2]
+                summaries.append(summary)
+                bucket[2] = 0
+        return summaries
+
+    def _report(self, summaries: List[logging.LogRecord]):
+        if self.report is not None:
+            for summary in summaries:
+                self.report(summary)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queues records, formatting them on the listener thread when that is safe.
+
+    The stock QueueHandler renders every message before enqueueing. Here a
+    record whose arguments are all immutable scalars is queued as is, so the
+    caller only pays for the enqueue. Any other record is rendered first:
+    mutable arguments could change before the listener formats them, and
+    their ``__repr__`` (ORM objects, for one) must not run on another thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        args = record.args
+        if isinstance(record.msg, str) and (not args or (
+            isinstance(args, tuple) and all(isinstance(arg, _IMMUTABLE_ARGS) for arg in args)
+        )):
+            return record
+
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[DeferredQueueHandler] = None
+_sampling_filter: Optional[SamplingFilter] = None
+
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """Route all logging through a queue drained by a background thread"""
+    global _listener, _queue_handler, _sampling_filter
+    if _listener is not None:
+        return _listener
+
+    formatter = JSONFormatter() if settings.LOG_FORMAT == "json" else logging.Formatter(
+        "%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+
+    handlers = [logging.StreamHandler()]
+    if settings.LOG_FILE:
+        handlers.append(logging.handlers.WatchedFileHandler(settings.LOG_FILE))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    _queue_handler = DeferredQueueHandler(log_queue)
+    _sampling_filter = SamplingFilter(
+        rate=settings.LOG_RATE_LIMIT,
+        burst=settings.LOG_RATE_BURST,
+        sample_rate=settings.LOG_SAMPLE_RATE,
+        # Summaries bypass the filter so they are never sampled away themselves
+        report=_queue_handler.emit
+    )
+    _queue_handler.addFilter(_sampling_filter)
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(settings.LOG_LEVEL)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def shutdown_logging():
+    """Flush queued records, stop the listener thread and log directly again"""
+    global _listener, _queue_handler, _sampling_filter
+    if _listener is None:
+        return
+
+    # Report what is still suppressed while the listener can write it
+    _sampling_filter.flush()
+    _sampling_filter = None
+
+    # Detach the queue first so records logged after this point are not
+    # queued with no listener left to write them
+    root = logging.getLogger()
+    root.removeHandler(_queue_handler)
+    root.addHandler(logging.StreamHandler())
+    _queue_handler = None
+
+    _listener.stop()
+    _listener = None
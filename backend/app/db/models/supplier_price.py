@@ -0,0 +1,22 @@
+# app/db/models/supplier_price.py
+from sqlalchemy import Column, String, Float, Date, UniqueConstraint
+from app.db.base import BaseModel
+
+class SupplierPrice(BaseModel):
+    __tablename__ = "supplier_prices"
+    __table_args__ = (
+        # One price per product per day per supplier; re-imports upsert on this key
+        UniqueConstraint("supplier_id", "product_code", "effective_date", name="uq_supplier_prices_product_date"),
+    )
+    
+    supplier_id = Column(String(64), nullable=False, index=True)
+    supplier_rating = Column(Float)
+    product_code = Column(String(128), nullable=False)
+    product_name = Column(String(255))
+    unit = Column(String(32))
+    currency = Column(String(3), default="ZAR")
+    price = Column(Float, nullable=False)
+    previous_price = Column(Float)
+    demand = Column(Float)
+    effective_date = Column(Date, nullable=False)
+    source_file = Column(String(255))
@@ -7,7 +7,9 @@ from app.core.config import settings
 from app.services.content_creation import ContentCreator
 from app.services.social_media import SocialMediaManager
 from app.services.email_marketing import EmailMarketer
+from app.services.data_analysis import DataAnalyst
 from app.ml.model_trainer import ModelTrainer
+from app.services.monitoring import record_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +31,8 @@ class AIHelper:
             self.specialized_helper = EmailMarketer()
         elif role == "model_trainer":
             self.specialized_helper = ModelTrainer()
+        elif role == "data_analyst":
+            self.specialized_helper = DataAnalyst()
     
     async def perform_task(self, task_data: Dict[str, Any] = None) -> Dict[str, Any]:
         """Perform a task based on the AI helper's role"""
@@ -44,16 +48,33 @@ class AIHelper:
                 result = await self.specialized_helper.send_campaign(task_data)
             elif self.role == "model_trainer":
                 result = await self.specialized_helper.train_model(task_data)
+            elif self.role == "data_analyst":
+                result = await self.specialized_helper.analyze(task_data)
             else:
                 result = {"status": "error", "message": f"Unknown role: {self.role}"}
             
-            logger.info(f"{self.name} completed task: {result.get('task', 'unknown')}")
+            logger.info("%s completed task: %s", self.name, result.get('task', 'unknown'))
+            await self._record_task_metrics(result)
             return result
             
         except Exception as e:
-            logger.error(f"Error in AI helper {self.name}: {str(e)}")
+            logger.error("Error in AI helper %s: %s", self.name, e)
             return {"status": "error", "message": str(e)}
     
+    async def _record_task_metrics(self, result: Dict[str, Any]):
+        """Record the dashboard metrics a completed task contributes"""
+        metrics = {}
+        if self.role == "content_creator" and result.get("status") == "success":
+            metrics["content_generated"] = 1
+        elif self.role == "email_marketer" and result.get("sent_count"):
+            metrics["emails_sent"] = result["sent_count"]
+
+        if metrics:
+            try:
+                await asyncio.to_thread(record_metrics, metrics, self.role)
+            except Exception as e:
+                logger.error("Error recording metrics for %s: %s", self.name, e)
+    
     def get_status(self) -> Dict[str, Any]:
         """Get the current status of the AI helper"""
         return {
@@ -97,7 +118,7 @@ async def run_ai_tasks(team: List[AIHelper]):
                     await ai.perform_task(task_data)
                     
                 except Exception as e:
-                    logger.error(f"Error running task for {ai.name}: {str(e)}")
+                    logger.error("Error running task for %s: %s", ai.name, e)
         
         # Wait before next iteration
         await asyncio.sleep(300)  # 5 minutes
@@ -0,0 +1,210 @@
+# app/helpers/similarity_index.py
+import logging
+import os
+import re
+import struct
+import threading
+import zlib
+import numpy as np
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Largest prime below 2**32, so every permuted hash still fits in a uint32
+MERSENNE_PRIME = np.uint64(4294967291)
+MAX_HASH = np.uint32(0xFFFFFFFF)
+
+# Odd multiplier used to fold the rows of a band into one 64-bit bucket key
+BAND_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+WORD_PATTERN = re.compile(r"\w+")
+
+# Each record is the label length, the sketch, then the UTF-8 label
+RECORD_HEADER = struct.Struct("<I")
+
+
+class SimilarityIndex:
+    """Persistent MinHash/LSH index for near-duplicate text detection.
+
+    Texts are reduced to word shingles and sketched into ``num_perm`` MinHash
+    values. The sketch is cut into ``bands`` bands whose bucket keys live in
+    one sorted uint64 array per band, so a lookup is ``bands`` binary searches
+    plus a vectorised Jaccard estimate over the few colliding items. Recent
+    additions sit in small per-band dicts until they are merged into the
+    sorted arrays.
+
+    Each sketch and its label are appended to ``<path>.idx`` as one record,
+    and the bucket arrays are rebuilt from the file on load. Loading never
+    modifies the file, so processes that only read it can start while another
+    is appending; a torn record at the end is skipped, and is cut off by the
+    next process that adds to the index.
+
+    Texts without any words have an empty sketch that matches nothing.
+    """
+
+    def __init__(self, path: str, num_perm: int = 128, bands: int = 16, threshold: float = 0.8,
+                 shingle_size: int = 3, merge_every: int = 10000, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+
+        self.path = path
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.merge_every = merge_every
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, int(MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, int(MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+        self._row_weights = BAND_MULTIPLIER ** np.arange(self.rows, dtype=np.uint64)
+
+        self._lock = threading.Lock()
+        self._signatures = np.empty((0, num_perm), dtype=np.uint32)
+        self._band_keys = np.empty((0, bands), dtype=np.uint64)
+        self._sorted_keys: List[np.ndarray] = []
+        self._sorted_ids: List[np.ndarray] = []
+        self._pending: List[dict] = []
+        self.size = 0
+        self.labels: List[str] = []
+        self._repaired = False
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._load()
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash sketch of a text's word shingles"""
+        words = WORD_PATTERN.findall(text.lower())
+        if not words:
+            shingles = set()
+        elif len(words) <= self.shingle_size:
+            shingles = {" ".join(words)}
+        else:
+            shingles = {
+                " ".join(words[i:i + self.shingle_size])
+                for i in range(len(words) - self.shingle_size + 1)
+            }
+
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles)
+        )
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % MERSENNE_PRIME
+        return permuted.min(axis=1).astype(np.uint32) if len(hashes) else np.full(self.num_perm, MAX_HASH)
+
+    def _keys_for(self, signatures: np.ndarray) -> np.ndarray:
+        """Bucket key of every band for one or more sketches"""
+        banded = signatures.reshape(-1, self.bands, self.rows).astype(np.uint64)
+        return (banded * self._row_weights).sum(axis=2, dtype=np.uint64)
+
+    def query(self, text: str) -> List[Tuple[int, float]]:
+        """Ids and estimated similarity of indexed items at or above the threshold"""
+        return self.query_signature(self.signature(text))
+
+    def query_signature(self, signature: np.ndarray) -> List[Tuple[int, float]]:
+        """Like query, for a precomputed sketch"""
+        if (signature == MAX_HASH).all():
+            return []
+
+        keys = self._keys_for(signature)[0]
+        candidates = set()
+        for band, key in enumerate(keys):
+            sorted_keys = self._sorted_keys[band]
+            lo = np.searchsorted(sorted_keys, key, side="left")
+            hi = np.searchsorted(sorted_keys, key, side="right")
+            if hi > lo:
+                candidates.update(self._sorted_ids[band][lo:hi].tolist())
+            candidates.update(self._pending[band].get(int(key), ()))
+
+        if not candidates:
+            return []
+
+        ids = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        similarity = (self._signatures[ids] == signature).mean(axis=1)
+        matches = similarity >= self.threshold
+        order = np.argsort(-similarity[matches])
+        return [(int(i), float(s)) for i, s in zip(ids[matches][order], similarity[matches][order])]
+
+    def is_duplicate(self, text: str) -> bool:
+        """Whether something similar to text has already been indexed"""
+        return bool(self.query(text))
+
+    def add(self, text: str, label: str = "") -> int:
+        """Index a text and persist its sketch, returning its id"""
+        signature = self.signature(text)
+        keys = self._keys_for(signature)
+
+        with self._lock:
+            item_id = self.size
+            self._append(signature[None, :], keys)
+            for band, key in enumerate(keys[0]):
+                self._pending[band].setdefault(int(key), []).append(item_id)
+            self.labels.append(label)
+            self.size += 1
+
+            encoded = label.encode("utf-8")
+            with open(f"{self.path}.idx", "ab") as f:
+                if not self._repaired:
+                    # Cut off a record torn by a crash so ours starts on a boundary
+                    f.truncate(self._read_records()[2])
+                    self._repaired = True
+                f.write(RECORD_HEADER.pack(len(encoded)) + signature.tobytes() + encoded)
+
+            if self.size - len(self._sorted_ids[0]) >= self.merge_every:
+                self._merge()
+
+        return item_id
+
+    def _append(self, signatures: np.ndarray, keys: np.ndarray):
+        """Append sketches to the in-memory buffers, growing them geometrically"""
+        needed = self.size + len(signatures)
+        if needed > len(self._signatures):
+            capacity = max(needed, 2 * len(self._signatures), 1024)
+            self._signatures = np.resize(self._signatures, (capacity, self.num_perm))
+            self._band_keys = np.resize(self._band_keys, (capacity, self.bands))
+        self._signatures[self.size:needed] = signatures
+        self._band_keys[self.size:needed] = keys
+
+    def _merge(self):
+        """Fold pending bucket entries into the sorted per-band arrays"""
+        keys = self._band_keys[:self.size]
+        self._sorted_ids = [np.argsort(keys[:, band], kind="stable") for band in range(self.bands)]
+        self._sorted_keys = [keys[order, band] for band, order in enumerate(self._sorted_ids)]
+        self._pending = [{} for _ in range(self.bands)]
+
+    def _read_records(self) -> Tuple[List[bytes], List[str], int]:
+        """Sketches and labels of the complete records on disk, and their total size"""
+        data = b""
+        if os.path.exists(f"{self.path}.idx"):
+            with open(f"{self.path}.idx", "rb") as f:
+                data = f.read()
+
+        sketch_size = self.num_perm * 4
+        sketches, labels, offset = [], [], 0
+        while offset + RECORD_HEADER.size + sketch_size <= len(data):
+            (label_size,) = RECORD_HEADER.unpack_from(data, offset)
+            end = offset + RECORD_HEADER.size + sketch_size + label_size
+            if end > len(data):
+                break
+            sketches.append(data[offset + RECORD_HEADER.size:end - label_size])
+            labels.append(data[end - label_size:end].decode("utf-8"))
+            offset = end
+        return sketches, labels, offset
+
+    def _load(self):
+        """Rebuild the index from the persisted records"""
+        sketches, labels, _ = self._read_records()
+        count = len(labels)
+        if count:
+            signatures = np.frombuffer(b"".join(sketches), dtype=np.uint32).reshape(count, self.num_perm)
+            self._append(signatures, self._keys_for(signatures))
+        self.size = count
+        self.labels = labels
+        self._merge()
+
+        if count:
+            logger.info("Loaded %s items into similarity index %s", count, self.path)
+
+    def label(self, item_id: int) -> Optional[str]:
+        """Label stored with an indexed item"""
+        return self.labels[item_id] if 0 <= item_id < self.size else None
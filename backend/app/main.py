@@ -1,19 +1,25 @@
 # app/main.py
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, File, Query, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.endpoints import router as api_router
 from app.core.config import settings
+from app.core.logging_config import setup_logging, shutdown_logging
+from app.core.leader_election import LeaderElector
 from app.db.session import engine, SessionLocal
 from app.db.base import Base
 from app.services.monitoring import start_monitoring
 from app.helpers.ai_helpers import create_ai_team, run_ai_tasks
+from app.services.data_analysis import analytics_store, MAX_OVERVIEW_DAYS
+from app.services.price_import import price_importer
+from typing import Optional
+import asyncio
 import logging
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 app = FastAPI(title=settings.PROJECT_NAME, version=settings.VERSION)
@@ -33,16 +39,23 @@ app.include_router(api_router, prefix=settings.API_V1_STR)
 # Create AI team
 ai_team = create_ai_team()
 
+def start_background_loops():
+    """Start the loops that must run in a single process"""
+    return [
+        start_monitoring(),
+        asyncio.create_task(run_ai_tasks(ai_team))
+    ]
+
+# Only the elected leader runs the background loops; every worker serves HTTP
+leader_elector = LeaderElector(start_background_loops)
+
 @app.on_event("startup")
 async def startup_event():
     """Startup event handler"""
     logger.info("Starting up CostByte backend...")
     
-    # Start monitoring service
-    start_monitoring()
-    
-    # Start AI tasks
-    run_ai_tasks(ai_team)
+    # Start monitoring and AI tasks once this process is elected leader
+    leader_elector.start()
     
     logger.info("CostByte backend started successfully")
 
@@ -50,6 +63,20 @@ async def startup_event():
 async def shutdown_event():
     """Shutdown event handler"""
     logger.info("Shutting down CostByte backend...")
+    
+    # Stop background loops and release leadership for another worker
+    was_leader = leader_elector.is_leader
+    await leader_elector.stop()
+    
+    # Keep prefetched content ideas for the next start; only the leader's
+    # pool is current, the others still hold what they loaded at startup
+    if was_leader:
+        for ai in ai_team:
+            if ai.role == "content_creator":
+                ai.specialized_helper.idea_pool.save()
+    
+    # Flush any records still queued for the logging thread
+    shutdown_logging()
 
 @app.get("/")
 async def root():
@@ -63,4 +90,21 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy"}
+    return {"status": "healthy", "leader": leader_elector.is_leader}
+
+@app.get("/dashboard/overview")
+async def dashboard_overview(days: int = Query(30, ge=1, le=MAX_OVERVIEW_DAYS)):
+    """Performance Overview aggregates served from the columnar analytics export"""
+    return await asyncio.to_thread(analytics_store.overview, days)
+
+@app.get("/dashboard/metrics/{metric_name}")
+async def dashboard_metric(metric_name: str, days: int = Query(30, ge=1, le=MAX_OVERVIEW_DAYS)):
+    """Period comparison and moving average of one analytics metric"""
+    return await asyncio.to_thread(analytics_store.metric_detail, metric_name, days)
+
+@app.post("/suppliers/{supplier_id}/price-lists")
+async def import_price_list(supplier_id: str, file: UploadFile = File(...), supplier_rating: Optional[float] = None):
+    """Bulk import a supplier price sheet (CSV or XLSX)"""
+    return await asyncio.to_thread(
+        price_importer.import_upload, file.file, file.filename, supplier_id, supplier_rating
+    )
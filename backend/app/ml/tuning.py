@@ -0,0 +1,173 @@
+# app/ml/tuning.py
+import logging
+import time
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.model_selection import KFold, ParameterSampler
+from sklearn.metrics import mean_absolute_error
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Search space for the random forest regressors used by ModelTrainer
+RANDOM_FOREST_PARAM_SPACE = {
+    "max_depth": [None, 4, 8, 12, 16],
+    "min_samples_split": [2, 5, 10],
+    "min_samples_leaf": [1, 2, 4],
+    "max_features": [1.0, "sqrt", 0.5],
+    "bootstrap": [True, False],
+}
+
+
+def _fit_and_score(estimator, params: Dict[str, Any], n_estimators: int, fold: Tuple[np.ndarray, ...]) -> float:
+    """Fit one candidate on one cached fold and return its validation MAE"""
+    X_train, y_train, X_val, y_val = fold
+    model = clone(estimator).set_params(n_estimators=n_estimators, **params)
+    model.fit(X_train, y_train)
+    return mean_absolute_error(y_val, model.predict(X_val))
+
+
+class SuccessiveHalvingSearch:
+    """Cross-validated random search that prunes candidates by successive halving.
+
+    Every candidate starts with a small forest; after each rung only the best
+    ``1 / eta`` survive and their forests grow by ``eta``. All (candidate, fold)
+    fits of a rung run in parallel across cores, and the fold arrays are built
+    once and shared by every candidate.
+
+    Fits are dispatched in batches of about one per core and the wall-clock
+    budget is checked between batches. A rung cut short by the budget is
+    discarded, except rung 0, where the candidates scored so far still pick
+    the winner. The overrun is therefore at most one batch.
+
+    The number of trees is only the halving resource: the winner is refit
+    with ``max_estimators`` whichever rung it was scored on.
+    """
+
+    def __init__(self, estimator=None, param_space: Dict[str, List[Any]] = None, n_candidates: int = 27,
+                 min_estimators: int = 20, max_estimators: int = 400, eta: int = 3, cv: int = 5,
+                 budget_seconds: float = 300, n_jobs: int = -1, random_state: int = 42):
+        self.estimator = estimator if estimator is not None else RandomForestRegressor(n_jobs=1, random_state=random_state)
+        self.param_space = param_space or RANDOM_FOREST_PARAM_SPACE
+        self.n_candidates = n_candidates
+        self.min_estimators = min_estimators
+        self.max_estimators = max_estimators
+        self.eta = eta
+        self.cv = cv
+        self.budget_seconds = budget_seconds
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+
+        self.best_params_: Optional[Dict[str, Any]] = None
+        self.best_n_estimators_: Optional[int] = None
+        self.best_score_: Optional[float] = None
+        self.trace_: List[Dict[str, Any]] = []
+        self.search_seconds_: float = 0.0
+
+    def _build_folds(self, X: np.ndarray, y: np.ndarray) -> List[Tuple[np.ndarray, ...]]:
+        """Split once and materialise contiguous fold arrays reused by all candidates"""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        y = np.ascontiguousarray(y, dtype=np.float64)
+        splitter = KFold(n_splits=self.cv, shuffle=True, random_state=self.random_state)
+        return [
+            (X[train_idx], y[train_idx], X[val_idx], y[val_idx])
+            for train_idx, val_idx in splitter.split(X)
+        ]
+
+    def fit(self, X: np.ndarray, y: np.ndarray) -> "SuccessiveHalvingSearch":
+        """Run the search within the wall-clock budget"""
+        started = time.perf_counter()
+        deadline = started + self.budget_seconds
+
+        folds = self._build_folds(X, y)
+        candidates = list(ParameterSampler(self.param_space, n_iter=self.n_candidates, random_state=self.random_state))
+        n_estimators = self.min_estimators
+        last_rung_seconds = 0.0
+
+        with Parallel(n_jobs=self.n_jobs) as parallel:
+            rung = 0
+            while candidates:
+                # Each rung keeps 1/eta of the candidates with eta times the
+                # trees, so its cost is roughly that of the previous one
+                if rung > 0 and time.perf_counter() + last_rung_seconds > deadline:
+                    logger.info("Search budget reached after %s rungs", rung)
+                    break
+
+                rung_started = time.perf_counter()
+                scores, out_of_time = self._run_rung(parallel, candidates, n_estimators, folds, deadline)
+                last_rung_seconds = time.perf_counter() - rung_started
+
+                if out_of_time and rung > 0:
+                    logger.info("Search budget reached during rung %s", rung)
+                    break
+
+                # Only rung 0 can end up here with part of its candidates scored
+                candidates = candidates[:len(scores)]
+                mean_scores = np.asarray(scores).mean(axis=1)
+                for params, score in zip(candidates, mean_scores):
+                    self.trace_.append({
+                        "rung": rung,
+                        "n_estimators": n_estimators,
+                        "params": params,
+                        "cv_mae": float(score),
+                    })
+
+                ranked = np.argsort(mean_scores)
+                self.best_params_ = candidates[ranked[0]]
+                self.best_n_estimators_ = n_estimators
+                self.best_score_ = float(mean_scores[ranked[0]])
+
+                logger.info(
+                    "Rung %d: %d candidates x %d trees in %.1fs, best cv_mae=%.4f",
+                    rung, len(candidates), n_estimators, last_rung_seconds, self.best_score_
+                )
+
+                if out_of_time:
+                    logger.info("Search budget reached during rung 0 after %s candidates", len(candidates))
+                    break
+                if len(candidates) == 1 or n_estimators >= self.max_estimators:
+                    break
+
+                keep = max(1, len(candidates) // self.eta)
+                candidates = [candidates[i] for i in ranked[:keep]]
+                n_estimators = min(n_estimators * self.eta, self.max_estimators)
+                rung += 1
+
+        self.search_seconds_ = time.perf_counter() - started
+        return self
+
+    def _run_rung(self, parallel: Parallel, candidates: List[Dict[str, Any]], n_estimators: int,
+                  folds: List[Tuple[np.ndarray, ...]], deadline: float) -> Tuple[List[List[float]], bool]:
+        """Score candidates on every fold, a batch at a time, until done or out of time.
+
+        Returns the per-fold scores of the candidates scored, in order, and
+        whether the deadline stopped the rung early.
+        """
+        per_batch = max(1, -(-effective_n_jobs(self.n_jobs) // len(folds)))
+        scores: List[List[float]] = []
+        for first in range(0, len(candidates), per_batch):
+            # The first batch always runs so that rung 0 yields a winner
+            if first and time.perf_counter() > deadline:
+                return scores, True
+            batch = candidates[first:first + per_batch]
+            fold_scores = parallel(
+                delayed(_fit_and_score)(self.estimator, params, n_estimators, fold)
+                for params in batch
+                for fold in folds
+            )
+            scores.extend(
+                fold_scores[i:i + len(folds)] for i in range(0, len(fold_scores), len(folds))
+            )
+        return scores, False
+
+    def best_estimator(self):
+        """Unfitted estimator with the best parameters and ``max_estimators`` trees.
+
+        It uses ``n_jobs`` cores for the refit; set ``n_jobs=1`` before
+        persisting it for single-row predictions.
+        """
+        return clone(self.estimator).set_params(
+            n_estimators=self.max_estimators, n_jobs=self.n_jobs, **self.best_params_
+        )
@@ -1,15 +1,32 @@
 # app/services/content_creation.py
 import logging
+import os
+import re
+from datetime import datetime
 from typing import Dict, Any, List
 import openai
 from app.core.config import settings
+from app.helpers.similarity_index import SimilarityIndex
+from app.services.idea_pool import IdeaPool
 
 logger = logging.getLogger(__name__)
 
+# Numbering or bullet the model puts in front of each listed idea
+LIST_MARKER = re.compile(r"^\s*(?:\d+[.)]|[-*•])\s*")
+
 class ContentCreator:
     def __init__(self):
         self.openai_api_key = settings.OPENAI_API_KEY
-        openai.api_key = self.openai_api_key
+        self.client = openai.AsyncOpenAI(api_key=self.openai_api_key, base_url=settings.OPENAI_API_BASE)
+        
+        # Memory of what has already been generated, checked before paying for a new call
+        threshold = settings.CONTENT_SIMILARITY_THRESHOLD
+        self.request_index = SimilarityIndex(os.path.join(settings.CONTENT_INDEX_DIR, "requests"), threshold=threshold)
+        self.content_index = SimilarityIndex(os.path.join(settings.CONTENT_INDEX_DIR, "content"), threshold=threshold)
+        self.idea_index = SimilarityIndex(os.path.join(settings.CONTENT_INDEX_DIR, "ideas"), threshold=threshold)
+        
+        # Ideas are prefetched in the background and served from memory
+        self.idea_pool = IdeaPool(self._request_content_ideas)
     
     async def create_content(self, content_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create content using AI"""
@@ -19,7 +36,24 @@ class ContentCreator:
             
             prompt = self._get_prompt_for_content_type(content_type, topic)
             
-            response = openai.ChatCompletion.create(
+            # Compare requests by what was asked for, not the templated prompt,
+            # whose shared boilerplate makes different topics look alike
+            request_key = self._request_key(content_type, topic)
+            if not content_data.get("allow_duplicate"):
+                matches = self.request_index.query(request_key)
+                if matches:
+                    item_id, similarity = matches[0]
+                    logger.info("Skipped %s about %s: similar to %s", content_type, topic, self.request_index.label(item_id))
+                    return {
+                        "status": "skipped",
+                        "reason": "duplicate",
+                        "content_type": content_type,
+                        "topic": topic,
+                        "duplicate_of": self.request_index.label(item_id),
+                        "similarity": similarity
+                    }
+            
+            response = await self.client.chat.completions.create(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "You are a content creator specializing in food cost management for restaurants and hotels."},
@@ -31,22 +65,33 @@ class ContentCreator:
             
             content = response.choices[0].message.content.strip()
             
+            # Record what was produced so later requests can be checked against it
+            content_matches = self.content_index.query(content)
+            label = f"{content_type}:{topic}:{datetime.utcnow().isoformat()}"
+            self.request_index.add(request_key, label)
+            self.content_index.add(content, label)
+            
             # Save content to database or file system
             result = {
                 "status": "success",
                 "content_type": content_type,
                 "topic": topic,
                 "content": content,
-                "word_count": len(content.split())
+                "word_count": len(content.split()),
+                "duplicate_of": self.content_index.label(content_matches[0][0]) if content_matches else None
             }
             
-            logger.info(f"Created {content_type} about {topic}")
+            logger.info("Created %s about %s", content_type, topic)
             return result
             
         except Exception as e:
-            logger.error(f"Error creating content: {str(e)}")
+            logger.error("Error creating content: %s", e)
             return {"status": "error", "message": str(e)}
     
+    def _request_key(self, content_type: str, topic: str) -> str:
+        """Normalised (content type, topic) pair used to spot repeated requests"""
+        return " ".join(f"{content_type} {topic}".lower().split())
+    
     def _get_prompt_for_content_type(self, content_type: str, topic: str) -> str:
         """Get appropriate prompt for different content types"""
         prompts = {
@@ -58,26 +103,40 @@ class ContentCreator:
         
         return prompts.get(content_type, f"Write about {topic} for the hospitality industry.")
     
-    async def generate_content_ideas(self, category: str = "food cost") -> List[str]:
-        """Generate content ideas using AI"""
+    async def generate_content_ideas(self, category: str = "food cost", count: int = 10) -> List[str]:
+        """Get content ideas from the prefetched pool"""
         try:
-            prompt = f"Generate 10 content ideas about {category} for restaurant and hotel businesses."
-            
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a content strategist for the hospitality industry."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=500,
-                temperature=0.8
-            )
-            
-            ideas = response.choices[0].message.content.strip().split('\n')
-            ideas = [idea for idea in ideas if idea.strip()]
-            
-            return ideas[:10]  # Return first 10 ideas
+            return await self.idea_pool.get(category, count)
             
         except Exception as e:
-            logger.error(f"Error generating content ideas: {str(e)}")
+            logger.error("Error generating content ideas: %s", e)
             return []
+    
+    async def _request_content_ideas(self, category: str) -> List[str]:
+        """Generate a batch of new content ideas using AI"""
+        prompt = f"Generate {settings.IDEA_POOL_BATCH_SIZE} content ideas about {category} for restaurant and hotel businesses."
+        
+        response = await self.client.chat.completions.create(
+            model="gpt-4",
+            messages=[
+                {"role": "system", "content": "You are a content strategist for the hospitality industry."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=1500,
+            temperature=0.8
+        )
+        
+        ideas = response.choices[0].message.content.strip().split('\n')
+        ideas = [idea for idea in ideas if idea.strip()]
+        
+        # Drop ideas similar to ones already suggested, including earlier in this batch
+        fresh_ideas = []
+        for idea in ideas:
+            # Ignore list numbering so "1. X" and "4. X" compare equal
+            text = LIST_MARKER.sub("", idea)
+            if self.idea_index.is_duplicate(text):
+                continue
+            self.idea_index.add(text, f"{category}:{datetime.utcnow().isoformat()}")
+            fresh_ideas.append(text)
+        
+        return fresh_ideas
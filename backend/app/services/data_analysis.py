@@ -0,0 +1,395 @@
+# app/services/data_analysis.py
+import logging
+import asyncio
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Callable, Tuple
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.db.models.ai_helper import AIHelperLog
+from app.db.models.analytics import Analytics
+
+logger = logging.getLogger(__name__)
+
+# Tables exported to the columnar store and the column each one is partitioned by
+EXPORT_TABLES = {
+    "analytics": (Analytics, "period_start"),
+    "ai_helper_logs": (AIHelperLog, "created_at"),
+}
+
+# Dashboard metric -> aggregation used for the "Performance Overview" cards.
+# Only metrics recorded from real activity: the AI helpers' completed tasks.
+DASHBOARD_METRICS = {
+    "content_generated": "sum",
+    "emails_sent": "sum",
+}
+
+# Daily buckets smoothed over a week for the trend lines
+TREND_FREQ = "1D"
+TREND_WINDOW = 7
+
+MAX_OVERVIEW_DAYS = 365
+
+EPOCH = datetime(1970, 1, 1)
+
+
+class AnalyticsStore:
+    """Read-only view over the partitioned Parquet export.
+
+    Files are laid out as ``<export_dir>/<table>/date=YYYY-MM-DD/part-*.parquet``
+    so a time window only opens the partitions it overlaps. Aggregates are
+    cached per (query, window) and the cache is dropped whenever an export
+    adds new partitions.
+    """
+
+    def __init__(self, export_dir: str, cache_size: int = 256):
+        self.export_dir = export_dir
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.version = 0
+
+    def invalidate(self):
+        """Drop cached aggregates after new data has been exported"""
+        with self._lock:
+            self.version += 1
+            self._cache.clear()
+
+    def _cached(self, key: tuple, compute: Callable[[], Any]) -> Any:
+        """Return a cached result for key, computing it on a miss"""
+        with self._lock:
+            key = key + (self.version,)
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        value = compute()
+
+        with self._lock:
+            self._cache[key] = value
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return value
+
+    def _partitions(self, table: str, start: datetime, end: datetime) -> List[str]:
+        """List the partition files overlapping [start, end)"""
+        table_dir = os.path.join(self.export_dir, table)
+        if not os.path.isdir(table_dir):
+            return []
+
+        first_day, last_day = start.date().isoformat(), end.date().isoformat()
+        paths = []
+        for entry in sorted(os.listdir(table_dir)):
+            if not entry.startswith("date="):
+                continue
+            day = entry[len("date="):]
+            if first_day <= day <= last_day:
+                partition_dir = os.path.join(table_dir, entry)
+                paths.extend(
+                    os.path.join(partition_dir, name)
+                    for name in sorted(os.listdir(partition_dir))
+                    if name.endswith(".parquet")
+                )
+        return paths
+
+    def load(self, table: str, start: datetime, end: datetime, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Load rows of an exported table whose time column falls in [start, end)"""
+        _, time_column = EXPORT_TABLES[table]
+        if columns is not None:
+            columns = list(dict.fromkeys(["id", time_column] + columns))
+
+        # Compaction may replace files while we read; list the partitions again
+        # if one disappears
+        for attempt in range(3):
+            paths = self._partitions(table, start, end)
+            if not paths:
+                return pd.DataFrame(columns=columns or ["id", time_column])
+            try:
+                frame = pd.concat([pd.read_parquet(path, columns=columns) for path in paths], ignore_index=True)
+                break
+            except FileNotFoundError:
+                if attempt == 2:
+                    raise
+
+        # A compacted file and the parts it replaces can briefly coexist
+        frame = frame.drop_duplicates("id")
+        mask = (frame[time_column] >= start) & (frame[time_column] < end)
+        return frame.loc[mask]
+
+    def group_by(self, table: str, by: List[str], start: datetime, end: datetime,
+                 value: str = "id", agg: str = "count") -> Dict[str, Any]:
+        """Aggregate a column of an exported table grouped by other columns"""
+        def compute():
+            frame = self.load(table, start, end, columns=by + [value])
+            if frame.empty:
+                return {}
+            grouped = frame.groupby(by)[value].agg(agg)
+            return {
+                "|".join(map(str, k)) if isinstance(k, tuple) else str(k): _to_json_number(v)
+                for k, v in grouped.items()
+            }
+
+        return self._cached(("group_by", table, tuple(by), value, agg, start, end), compute)
+
+    def _metric_series(self, metric_name: str, start: datetime, end: datetime) -> pd.Series:
+        """Time-indexed values of one analytics metric"""
+        frame = self.load("analytics", start, end, columns=["metric_name", "metric_value"])
+        frame = frame[frame["metric_name"] == metric_name]
+        return frame.set_index("period_start")["metric_value"].sort_index()
+
+    def moving_average(self, metric_name: str, start: datetime, end: datetime,
+                       freq: str = TREND_FREQ, window: int = TREND_WINDOW) -> List[Dict[str, Any]]:
+        """Resample a metric to freq buckets and smooth it with a rolling mean"""
+        def compute():
+            return _moving_average(self._metric_series(metric_name, start, end), freq, window)
+
+        return self._cached(("moving_average", metric_name, start, end, freq, window), compute)
+
+    def compare_periods(self, metric_name: str, start: datetime, end: datetime, agg: str = "sum") -> Dict[str, Any]:
+        """Compare a metric over [start, end) with the window of equal length before it"""
+        def compute():
+            series = self._metric_series(metric_name, start - (end - start), end)
+            return _compare(metric_name, series, start, agg)
+
+        return self._cached(("compare_periods", metric_name, start, end, agg), compute)
+
+    def _window(self, days: int, now: Optional[datetime]) -> Tuple[datetime, datetime]:
+        """The last days up to now, aligned to the cache granularity"""
+        if not 1 <= days <= MAX_OVERVIEW_DAYS:
+            raise ValueError(f"days must be between 1 and {MAX_OVERVIEW_DAYS}")
+
+        # Requests inside the same bucket share cached results instead of each
+        # opening the partitions
+        now = now or datetime.utcnow()
+        bucket = max(settings.ANALYTICS_CACHE_WINDOW, 1)
+        elapsed = (now - EPOCH).total_seconds()
+        end = EPOCH + timedelta(seconds=(elapsed // bucket + 1) * bucket)
+        return end - timedelta(days=days), end
+
+    def metric_detail(self, metric_name: str, days: int = 30, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Period comparison and moving average of any recorded metric"""
+        start, end = self._window(days, now)
+        return {
+            "window": {"start": start.isoformat(), "end": end.isoformat()},
+            "comparison": self.compare_periods(metric_name, start, end, DASHBOARD_METRICS.get(metric_name, "sum")),
+            "trend": self.moving_average(metric_name, start, end),
+        }
+
+    def overview(self, days: int = 30, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Aggregates backing the dashboard's Performance Overview"""
+        start, end = self._window(days, now)
+
+        def compute():
+            # Read the analytics partitions once and split them per metric
+            frame = self.load("analytics", start - (end - start), end, columns=["metric_name", "metric_value"])
+            frame = frame[frame["metric_name"].isin(list(DASHBOARD_METRICS))]
+            series = {
+                name: group.set_index("period_start")["metric_value"].sort_index()
+                for name, group in frame.groupby("metric_name")
+            }
+            empty = pd.Series(dtype=float, index=pd.DatetimeIndex([]))
+
+            return {
+                "window": {"start": start.isoformat(), "end": end.isoformat()},
+                "metrics": {
+                    name: _compare(name, series.get(name, empty), start, agg)
+                    for name, agg in DASHBOARD_METRICS.items()
+                },
+                "trends": {
+                    name: _moving_average(series.get(name, empty)[start:], TREND_FREQ, TREND_WINDOW)
+                    for name in DASHBOARD_METRICS
+                },
+                "helper_activity": self.group_by("ai_helper_logs", ["task", "status"], start, end),
+            }
+
+        return self._cached(("overview", start, end), compute)
+
+
+def _compare(metric_name: str, series: pd.Series, start: datetime, agg: str) -> Dict[str, Any]:
+    """Aggregate a metric before and after start and the relative change"""
+    current = _aggregate(series[series.index >= start], agg)
+    previous = _aggregate(series[series.index < start], agg)
+
+    change_pct = None
+    if current is not None and previous:
+        change_pct = round((current - previous) / abs(previous) * 100, 2)
+
+    return {"metric": metric_name, "current": current, "previous": previous, "change_pct": change_pct}
+
+
+def _moving_average(series: pd.Series, freq: str, window: int) -> List[Dict[str, Any]]:
+    """Resample to freq buckets and smooth with a rolling mean over window buckets"""
+    if series.empty:
+        return []
+    resampled = series.resample(freq).mean()
+    smoothed = resampled.rolling(window, min_periods=1).mean()
+    return [
+        {"period": ts.isoformat(), "value": _to_json_number(v), "moving_average": _to_json_number(m)}
+        for ts, v, m in zip(resampled.index, resampled.values, smoothed.values)
+    ]
+
+
+def _aggregate(series: pd.Series, agg: str) -> Optional[float]:
+    """Reduce a metric series, returning None when there is no data"""
+    if series.empty:
+        return None
+    if agg == "last":
+        return _to_json_number(series.iloc[-1])
+    return _to_json_number(series.agg(agg))
+
+
+def _to_json_number(value: Any) -> Optional[float]:
+    """Convert NumPy scalars to JSON-safe floats"""
+    if value is None or (isinstance(value, (float, np.floating)) and np.isnan(value)):
+        return None
+    return float(value)
+
+
+analytics_store = AnalyticsStore(settings.ANALYTICS_EXPORT_DIR)
+
+
+class DataAnalyst:
+    """Incrementally exports the Analytics and log tables to Parquet.
+
+    Both tables are append-only, so the highest exported primary key per
+    table is kept as a watermark and each run only reads newer rows.
+    """
+
+    def __init__(self, export_dir: Optional[str] = None, store: Optional[AnalyticsStore] = None):
+        self.export_dir = export_dir or settings.ANALYTICS_EXPORT_DIR
+        self.batch_size = settings.ANALYTICS_EXPORT_BATCH_SIZE
+        self.store = store or analytics_store
+        self.watermarks_path = os.path.join(self.export_dir, "_watermarks.json")
+        os.makedirs(self.export_dir, exist_ok=True)
+
+    async def analyze(self, task_data: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Export new rows to the columnar store"""
+        try:
+            exported = await asyncio.to_thread(self.export_tables)
+            return {
+                "status": "success",
+                "task": "export_analytics",
+                "exported": exported,
+                "exported_at": datetime.utcnow().isoformat()
+            }
+
+        except Exception as e:
+            logger.error("Error exporting analytics: %s", e)
+            return {"status": "error", "message": str(e)}
+
+    def export_tables(self) -> Dict[str, int]:
+        """Export rows added since the last run, returning row counts per table"""
+        watermarks = self._load_watermarks()
+        exported = {}
+
+        db = SessionLocal()
+        try:
+            for table, (model, time_column) in EXPORT_TABLES.items():
+                exported[table] = 0
+                while True:
+                    last_id = watermarks.get(table, 0)
+                    result = db.execute(
+                        select(model.__table__)
+                        .where(model.id > last_id)
+                        .order_by(model.id)
+                        .limit(self.batch_size)
+                    )
+                    frame = pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+                    if frame.empty:
+                        break
+
+                    self._write_partitions(table, time_column, frame)
+
+                    # Persist the watermark after each batch so an interrupted
+                    # export resumes where it stopped
+                    watermarks[table] = int(frame["id"].max())
+                    self._save_watermarks(watermarks)
+                    exported[table] += len(frame)
+        finally:
+            db.close()
+
+        compacted = sum(self._compact_partitions(table) for table in EXPORT_TABLES)
+
+        if any(exported.values()) or compacted:
+            self.store.invalidate()
+            logger.info("Exported analytics rows: %s", exported)
+
+        return exported
+
+    def _write_partitions(self, table: str, time_column: str, frame: pd.DataFrame):
+        """Write one batch as a Parquet file per day partition"""
+        frame[time_column] = pd.to_datetime(frame[time_column])
+        days = frame[time_column].dt.strftime("%Y-%m-%d").fillna("unknown")
+
+        for day, part in frame.groupby(days):
+            partition_dir = os.path.join(self.export_dir, table, f"date={day}")
+            os.makedirs(partition_dir, exist_ok=True)
+
+            name = f"part-{int(part['id'].min()):012d}-{int(part['id'].max()):012d}.parquet"
+            tmp_path = os.path.join(partition_dir, f".{name}.tmp")
+            part.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, os.path.join(partition_dir, name))
+
+    def _compact_partitions(self, table: str) -> int:
+        """Merge the per-export files of each day partition into one file.
+
+        Every export run adds a small file to each day it touches. Closed days
+        are folded into a single file; the current day is folded once it has
+        ANALYTICS_COMPACT_THRESHOLD files, since it keeps growing.
+        """
+        table_dir = os.path.join(self.export_dir, table)
+        if not os.path.isdir(table_dir):
+            return 0
+
+        today = f"date={datetime.utcnow().date().isoformat()}"
+        compacted = 0
+        for entry in sorted(os.listdir(table_dir)):
+            partition_dir = os.path.join(table_dir, entry)
+            if not entry.startswith("date=") or not os.path.isdir(partition_dir):
+                continue
+
+            paths = [
+                os.path.join(partition_dir, name)
+                for name in sorted(os.listdir(partition_dir))
+                if name.endswith(".parquet")
+            ]
+            threshold = settings.ANALYTICS_COMPACT_THRESHOLD if entry == today else 2
+            if len(paths) < threshold:
+                continue
+
+            frame = pd.concat([pd.read_parquet(path) for path in paths], ignore_index=True)
+            frame = frame.drop_duplicates("id").sort_values("id")
+
+            name = f"part-{int(frame['id'].min()):012d}-{int(frame['id'].max()):012d}.parquet"
+            target = os.path.join(partition_dir, name)
+            tmp_path = os.path.join(partition_dir, f".{name}.tmp")
+            frame.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, target)
+
+            # Readers drop duplicate ids, so the old parts can go after the new file is in place
+            for path in paths:
+                if path != target:
+                    os.remove(path)
+            compacted += 1
+
+        return compacted
+
+    def _load_watermarks(self) -> Dict[str, int]:
+        """Load the last exported id per table"""
+        if not os.path.exists(self.watermarks_path):
+            return {}
+        with open(self.watermarks_path) as f:
+            return json.load(f)
+
+    def _save_watermarks(self, watermarks: Dict[str, int]):
+        """Atomically persist the last exported id per table"""
+        tmp_path = f"{self.watermarks_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(watermarks, f)
+        os.replace(tmp_path, self.watermarks_path)
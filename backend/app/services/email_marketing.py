@@ -56,7 +56,7 @@ class EmailMarketer:
             }
             
         except Exception as e:
-            logger.error(f"Error sending email campaign: {str(e)}")
+            logger.error("Error sending email campaign: %s", e)
             return {"status": "error", "message": str(e)}
     
     def _get_recipients(self, audience: str) -> List[Dict[str, str]]:
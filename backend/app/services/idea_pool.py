@@ -0,0 +1,146 @@
+# app/services/idea_pool.py
+import logging
+import asyncio
+import json
+import os
+import tempfile
+import time
+from collections import deque
+from typing import Dict, List, Callable, Awaitable, Deque, Tuple
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class IdeaPool:
+    """Per-category pool of pre-generated content ideas.
+
+    Ideas are served from memory; whenever a category drops below the
+    low-water mark a background task tops it back up to ``pool_size`` using
+    ``fetch_ideas``; callers finding a category empty wait only for the first
+    batch of that refill. Ideas older than ``ttl`` seconds are discarded, and the
+    pool is saved to ``path`` after each refill and on shutdown so it
+    survives restarts.
+    """
+
+    def __init__(self, fetch_ideas: Callable[[str], Awaitable[List[str]]], path: str = None,
+                 low_water: int = None, pool_size: int = None, ttl: int = None, max_attempts: int = 3):
+        self.fetch_ideas = fetch_ideas
+        self.path = path or settings.IDEA_POOL_PATH
+        self.low_water = low_water or settings.IDEA_POOL_LOW_WATER
+        self.pool_size = pool_size or settings.IDEA_POOL_SIZE
+        self.ttl = ttl or settings.IDEA_POOL_TTL
+        self.max_attempts = max_attempts
+
+        self._pools: Dict[str, Deque[Tuple[str, float]]] = {}
+        self._refills: Dict[str, asyncio.Task] = {}
+        self._batch_ready: Dict[str, asyncio.Event] = {}
+        self._load()
+
+    async def get(self, category: str, count: int = 10) -> List[str]:
+        """Take up to count ideas for a category, scheduling a refill if it runs low"""
+        pool = self._pools.setdefault(category, deque())
+        self._expire(pool)
+
+        # Only a cold category waits for the API, and only for the next batch;
+        # the rest of the refill carries on in the background. Waiting on an
+        # event rather than the task keeps a cancelled caller from cancelling
+        # the refill other callers share.
+        if not pool:
+            self.schedule_refill(category)
+            batch_ready = self._batch_ready[category]
+            batch_ready.clear()
+            await batch_ready.wait()
+
+        ideas = [pool.popleft()[0] for _ in range(min(count, len(pool)))]
+
+        if len(pool) < self.low_water:
+            self.schedule_refill(category)
+
+        return ideas
+
+    def size(self, category: str) -> int:
+        """Number of unexpired ideas available for a category"""
+        pool = self._pools.get(category)
+        if pool is None:
+            return 0
+        self._expire(pool)
+        return len(pool)
+
+    def schedule_refill(self, category: str):
+        """Start a background refill unless one is already running"""
+        self._batch_ready.setdefault(category, asyncio.Event())
+        task = self._refills.get(category)
+        if task is None or task.done():
+            self._refills[category] = asyncio.create_task(self._refill(category))
+
+    async def _refill(self, category: str):
+        """Fetch ideas until the category reaches pool_size"""
+        pool = self._pools.setdefault(category, deque())
+        known = {idea for idea, _ in pool}
+
+        try:
+            for _ in range(self.max_attempts):
+                if len(pool) >= self.pool_size:
+                    break
+
+                now = time.time()
+                fresh = [idea for idea in await self.fetch_ideas(category) if idea not in known]
+                if not fresh:
+                    break
+
+                known.update(fresh)
+                pool.extend((idea, now) for idea in fresh)
+                self._batch_ready[category].set()
+
+            logger.info("Refilled idea pool for %s: %s ideas", category, len(pool))
+            await asyncio.to_thread(self._write, self._snapshot())
+
+        except Exception as e:
+            logger.error("Error refilling idea pool for %s: %s", category, e)
+
+        finally:
+            # Release waiters even when the refill produced nothing
+            self._batch_ready[category].set()
+
+    def _expire(self, pool: Deque[Tuple[str, float]]):
+        """Drop ideas older than the TTL; the oldest are always at the left"""
+        cutoff = time.time() - self.ttl
+        while pool and pool[0][1] < cutoff:
+            pool.popleft()
+
+    def _load(self):
+        """Restore pooled ideas saved by a previous process"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            for category, items in data.items():
+                pool = deque((idea, created) for idea, created in items)
+                self._expire(pool)
+                self._pools[category] = pool
+        except Exception as e:
+            logger.error("Error loading idea pool: %s", e)
+
+    def save(self):
+        """Persist the pooled ideas"""
+        self._write(self._snapshot())
+
+    def _snapshot(self) -> Dict[str, List[Tuple[str, float]]]:
+        """Copy the pools on the event loop so they can be written from a thread"""
+        return {category: list(pool) for category, pool in self._pools.items()}
+
+    def _write(self, data: Dict[str, List[Tuple[str, float]]]):
+        """Atomically write a pool snapshot to disk"""
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        # A private temp file, so concurrent writers cannot truncate each other's
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".idea_pool-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
@@ -24,7 +24,7 @@ class MonitoringService:
                 logger.info("Monitoring check completed")
                 
             except Exception as e:
-                logger.error(f"Error in monitoring service: {str(e)}")
+                logger.error("Error in monitoring service: %s", e)
             
             await asyncio.sleep(self.interval)
     
@@ -45,10 +45,13 @@ class MonitoringService:
                 "timestamp": datetime.utcnow().isoformat()
             }
             
-            logger.info(f"System health: {health_status}")
+            logger.info(
+                "System health: database %s, external services %s",
+                health_status["database"], health_status["external_services"]
+            )
             
         except Exception as e:
-            logger.error(f"System health check failed: {str(e)}")
+            logger.error("System health check failed: %s", e)
     
     async def _log_performance_metrics(self):
         """Log performance metrics to database"""
@@ -81,7 +84,7 @@ class MonitoringService:
             logger.info("Performance metrics logged")
             
         except Exception as e:
-            logger.error(f"Error logging performance metrics: {str(e)}")
+            logger.error("Error logging performance metrics: %s", e)
     
     async def _check_ai_helpers(self):
         """Check AI helpers status and restart if needed"""
@@ -93,7 +96,7 @@ class MonitoringService:
             for helper in helpers:
                 # Check if helper is active and responding
                 if helper.last_active and (datetime.utcnow() - helper.last_active).total_seconds() > 3600:  # 1 hour
-                    logger.warning(f"AI helper {helper.name} is not responding")
+                    logger.warning("AI helper %s is not responding", helper.name)
                     
                     # Attempt to restart
                     helper.is_active = True
@@ -112,9 +115,27 @@ class MonitoringService:
             db.close()
             
         except Exception as e:
-            logger.error(f"Error checking AI helpers: {str(e)}")
+            logger.error("Error checking AI helpers: %s", e)
 
-def start_monitoring():
+def record_metrics(metrics: Dict[str, float], metric_type: str, period: str = "event"):
+    """Write point-in-time metrics to Analytics for the dashboard export"""
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        for metric_name, metric_value in metrics.items():
+            db.add(Analytics(
+                metric_name=metric_name,
+                metric_value=metric_value,
+                metric_type=metric_type,
+                period=period,
+                period_start=now,
+                period_end=now
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+def start_monitoring() -> asyncio.Task:
     """Start the monitoring service"""
     monitor = MonitoringService()
-    asyncio.create_task(monitor.start_monitoring())
+    return asyncio.create_task(monitor.start_monitoring())
@@ -0,0 +1,349 @@
+# app/services/price_import.py
+import io
+import logging
+import math
+import os
+import re
+import shutil
+import tempfile
+import time
+from datetime import date
+from typing import Dict, Any, Iterator, Optional, BinaryIO, Tuple
+import pandas as pd
+from sqlalchemy import or_, func
+from app.core.config import settings
+from app.db.session import engine
+from app.db.models.supplier_price import SupplierPrice
+
+logger = logging.getLogger(__name__)
+
+# Header spellings seen on supplier sheets, mapped to our column names
+COLUMN_ALIASES = {
+    "product_code": ["product_code", "code", "sku", "item_code", "item_no", "product_id", "article"],
+    "product_name": ["product_name", "name", "description", "product", "item", "item_description"],
+    "unit": ["unit", "uom", "unit_of_measure", "pack_size"],
+    "currency": ["currency", "curr"],
+    "price": ["price", "unit_price", "cost", "price_excl_vat", "new_price", "current_price"],
+    "previous_price": ["previous_price", "old_price", "last_price", "prior_price"],
+    "demand": ["demand", "forecast", "forecast_qty", "expected_demand", "volume"],
+    "effective_date": ["effective_date", "date", "valid_from", "price_date"],
+    "supplier_rating": ["supplier_rating", "rating"],
+}
+
+KEY_COLUMNS = ["supplier_id", "product_code", "effective_date"]
+DATA_COLUMNS = [
+    "supplier_rating", "product_name", "unit", "currency", "price", "previous_price", "demand", "source_file"
+]
+COLUMNS = KEY_COLUMNS + DATA_COLUMNS
+
+# A sheet without these cannot produce a single valid row
+REQUIRED_COLUMNS = ["product_code", "price"]
+
+# XLSX files are ZIP archives
+XLSX_SIGNATURE = b"PK\x03\x04"
+
+DIGITS = re.compile(r"\d*")
+
+
+class PriceListImporter:
+    """Streams supplier price sheets (CSV or XLSX) into supplier_prices.
+
+    Files are read in chunks of ``chunk_size`` rows. Each chunk is normalised
+    with vectorised pandas operations and upserted in one round trip: COPY
+    into a staging table on Postgres, executemany elsewhere. Rows are keyed
+    on (supplier, product, effective date) and unchanged rows are not
+    rewritten, so importing the same sheet twice leaves the table as it was.
+    """
+
+    def __init__(self, chunk_size: int = None):
+        self.chunk_size = chunk_size or settings.PRICE_IMPORT_CHUNK_SIZE
+        self.table = SupplierPrice.__table__
+        self.is_postgres = engine.dialect.name == "postgresql"
+
+    def import_upload(self, fileobj: BinaryIO, filename: str, supplier_id: str,
+                      supplier_rating: Optional[float] = None) -> Dict[str, Any]:
+        """Spool an uploaded file to disk and import it"""
+        # Clients may omit the filename; the format is sniffed from the content
+        filename = filename or "upload"
+        suffix = os.path.splitext(filename)[1].lower()
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+            shutil.copyfileobj(fileobj, tmp)
+        try:
+            return self.import_file(tmp.name, supplier_id, supplier_rating, source_file=filename)
+        finally:
+            os.unlink(tmp.name)
+
+    def import_file(self, path: str, supplier_id: str, supplier_rating: Optional[float] = None,
+                    source_file: Optional[str] = None) -> Dict[str, Any]:
+        """Import a price sheet and report row counts and throughput"""
+        started = time.perf_counter()
+        source_file = source_file or os.path.basename(path)
+        report = {
+            "rows_read": 0,
+            "rows_valid": 0,
+            "rows_upserted": 0,
+            "rejected": {"missing_product_code": 0, "invalid_price": 0, "invalid_date": 0}
+        }
+
+        try:
+            for chunk in self._read_chunks(path):
+                report["rows_read"] += len(chunk)
+                frame, rejected = self._normalise(chunk, supplier_id, supplier_rating, source_file)
+                for reason, count in rejected.items():
+                    report["rejected"][reason] += count
+
+                if frame.empty:
+                    continue
+                report["rows_valid"] += len(frame)
+                report["rows_upserted"] += self._upsert(frame)
+
+        except Exception as e:
+            logger.error("Error importing price list %s: %s", source_file, e)
+            return {"status": "error", "message": str(e), **report}
+
+        seconds = time.perf_counter() - started
+        rows_per_second = report["rows_read"] / seconds if seconds else 0.0
+        logger.info(
+            "Imported %s for supplier %s: %d rows read, %d upserted in %.1fs (%.0f rows/s)",
+            source_file, supplier_id, report["rows_read"], report["rows_upserted"], seconds, rows_per_second
+        )
+
+        return {
+            "status": "success",
+            "supplier_id": supplier_id,
+            "source_file": source_file,
+            **report,
+            "rows_rejected": sum(report["rejected"].values()),
+            "seconds": seconds,
+            "rows_per_second": rows_per_second
+        }
+
+    def _read_chunks(self, path: str) -> Iterator[pd.DataFrame]:
+        """Yield the sheet in DataFrames of at most chunk_size rows"""
+        with open(path, "rb") as f:
+            is_xlsx = f.read(len(XLSX_SIGNATURE)) == XLSX_SIGNATURE
+        if is_xlsx:
+            yield from self._read_xlsx_chunks(path)
+            return
+
+        # Some suppliers export with semicolons because of decimal commas
+        with open(path, encoding="utf-8-sig", errors="replace") as f:
+            header = f.readline()
+        sep = ";" if header.count(";") > header.count(",") else ","
+
+        yield from pd.read_csv(
+            path, sep=sep, chunksize=self.chunk_size, dtype=str, keep_default_na=False,
+            skipinitialspace=True, encoding="utf-8-sig"
+        )
+
+    def _read_xlsx_chunks(self, path: str) -> Iterator[pd.DataFrame]:
+        """Stream the first worksheet without loading the whole workbook"""
+        from openpyxl import load_workbook
+
+        # Opened here because openpyxl refuses paths without an Excel extension
+        with open(path, "rb") as f:
+            workbook = load_workbook(f, read_only=True, data_only=True)
+            try:
+                rows = workbook.active.iter_rows(values_only=True)
+                header = [str(cell) if cell is not None else "" for cell in next(rows, ())]
+                batch = []
+                for row in rows:
+                    batch.append(row)
+                    # Keep cells as read; a blank cell would otherwise turn a column
+                    # of integer product codes into floats for this chunk only
+                    if len(batch) >= self.chunk_size:
+                        yield pd.DataFrame(batch, columns=header, dtype=object)
+                        batch = []
+                if batch:
+                    yield pd.DataFrame(batch, columns=header, dtype=object)
+            finally:
+                workbook.close()
+
+    def _normalise(self, chunk: pd.DataFrame, supplier_id: str, supplier_rating: Optional[float],
+                   source_file: str) -> Tuple[pd.DataFrame, Dict[str, int]]:
+        """Map headers, coerce types and drop invalid rows for one chunk"""
+        chunk = chunk.rename(columns=_canonical_columns(chunk.columns))
+        for column in REQUIRED_COLUMNS:
+            if column not in chunk:
+                raise ValueError(
+                    f"No {column} column found; expected a header such as {', '.join(COLUMN_ALIASES[column])}"
+                )
+
+        frame = pd.DataFrame(index=chunk.index)
+        frame["supplier_id"] = supplier_id
+        frame["product_code"] = _text(chunk.get("product_code"), chunk.index).str.upper()
+        frame["product_name"] = _text(chunk.get("product_name"), chunk.index)
+        frame["unit"] = _text(chunk.get("unit"), chunk.index).str.lower()
+        frame["currency"] = _text(chunk.get("currency"), chunk.index).str.upper().replace("", "ZAR")
+        frame["price"] = _number(chunk.get("price"), chunk.index)
+        frame["previous_price"] = _number(chunk.get("previous_price"), chunk.index)
+        frame["demand"] = _number(chunk.get("demand"), chunk.index)
+        frame["supplier_rating"] = _number(chunk.get("supplier_rating"), chunk.index)
+        if supplier_rating is not None:
+            frame["supplier_rating"] = frame["supplier_rating"].fillna(supplier_rating)
+        frame["source_file"] = source_file
+
+        if "effective_date" in chunk:
+            # ISO dates are unambiguous; only fall back to day-first parsing
+            # (31/01/2024, 01.02.2024) for values that are not ISO
+            raw = chunk["effective_date"]
+            dates = pd.to_datetime(raw, errors="coerce", format="ISO8601")
+            retry = dates.isna()
+            if retry.any():
+                dates[retry] = pd.to_datetime(raw[retry], errors="coerce", format="mixed", dayfirst=True)
+            frame["effective_date"] = dates.dt.date
+            bad_date = dates.isna()
+        else:
+            frame["effective_date"] = date.today()
+            bad_date = pd.Series(False, index=chunk.index)
+
+        missing_code = frame["product_code"] == ""
+        bad_price = ~(frame["price"] > 0)
+        rejected = {
+            "missing_product_code": int(missing_code.sum()),
+            "invalid_price": int((bad_price & ~missing_code).sum()),
+            "invalid_date": int((bad_date & ~bad_price & ~missing_code).sum()),
+        }
+
+        frame = frame.loc[~(missing_code | bad_price | bad_date), COLUMNS]
+        # A sheet may list a product twice; the last line wins, as on re-import
+        frame = frame.drop_duplicates(subset=KEY_COLUMNS, keep="last")
+        return frame, rejected
+
+    def _upsert(self, frame: pd.DataFrame) -> int:
+        """Write one normalised chunk, returning the number of rows changed"""
+        if self.is_postgres:
+            return self._copy_upsert(frame)
+        return self._executemany_upsert(frame)
+
+    def _copy_upsert(self, frame: pd.DataFrame) -> int:
+        """COPY the chunk into a staging table and merge it in one statement"""
+        buffer = io.StringIO()
+        frame.to_csv(buffer, index=False, header=False, na_rep="")
+        buffer.seek(0)
+
+        columns = ", ".join(COLUMNS)
+        changed = " OR ".join(f"t.{c} IS DISTINCT FROM EXCLUDED.{c}" for c in DATA_COLUMNS)
+        updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in DATA_COLUMNS)
+
+        raw = engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            cursor.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS supplier_prices_stage ("
+                "supplier_id text, product_code text, effective_date date, supplier_rating double precision, "
+                "product_name text, unit text, currency text, price double precision, "
+                "previous_price double precision, demand double precision, source_file text"
+                ") ON COMMIT DELETE ROWS"
+            )
+            cursor.copy_expert(
+                f"COPY supplier_prices_stage ({columns}) FROM STDIN WITH (FORMAT csv, NULL '')", buffer
+            )
+            cursor.execute(
+                f"INSERT INTO supplier_prices AS t ({columns}, created_at, updated_at) "
+                f"SELECT {columns}, now(), now() FROM supplier_prices_stage "
+                f"ON CONFLICT ({', '.join(KEY_COLUMNS)}) DO UPDATE SET {updates}, updated_at = now() "
+                f"WHERE {changed}"
+            )
+            upserted = cursor.rowcount
+            raw.commit()
+            return upserted
+        except Exception:
+            raw.rollback()
+            raise
+        finally:
+            raw.close()
+
+    def _executemany_upsert(self, frame: pd.DataFrame) -> int:
+        """Batched INSERT ... ON CONFLICT for SQLite"""
+        from sqlalchemy.dialects.sqlite import insert
+
+        records = frame.astype(object).where(frame.notna(), None).to_dict("records")
+        stmt = insert(self.table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=KEY_COLUMNS,
+            set_={**{c: stmt.excluded[c] for c in DATA_COLUMNS}, "updated_at": func.now()},
+            where=or_(*(self.table.c[c].is_distinct_from(stmt.excluded[c]) for c in DATA_COLUMNS))
+        )
+
+        with engine.begin() as conn:
+            return conn.execute(stmt, records).rowcount
+
+
+def _canonical_columns(columns) -> Dict[str, str]:
+    """Rename map from a sheet's headers to canonical column names"""
+    lookup = {alias: name for name, aliases in COLUMN_ALIASES.items() for alias in aliases}
+    renames = {}
+    for column in columns:
+        key = "_".join(str(column).strip().lower().replace(".", " ").replace("-", " ").split())
+        if key in lookup and lookup[key] not in renames.values():
+            renames[column] = lookup[key]
+    return renames
+
+
+def _text(series: Optional[pd.Series], index: pd.Index) -> pd.Series:
+    """Trimmed strings, with missing cells as empty strings and 10003.0 as '10003'"""
+    if series is None:
+        return pd.Series("", index=index)
+    return series.map(_cell_text).str.strip()
+
+
+def _cell_text(value: Any) -> str:
+    """Render one cell, dropping the '.0' spreadsheets add to numeric codes"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _number(series: Optional[pd.Series], index: pd.Index) -> pd.Series:
+    """Parse prices like 'R 1 234,50' or '1,234.50' into floats, NaN when invalid"""
+    if series is None:
+        return pd.Series(float("nan"), index=index)
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype(float)
+
+    # Sheets repeat the same few prices, so parse each distinct value once
+    parsed = {value: _parse_number(value) for value in series.dropna().unique()}
+    return series.map(parsed).astype(float)
+
+
+def _parse_number(value: Any) -> float:
+    """Parse one cell, taking the last '.' or ',' as the decimal separator.
+
+    The other separator may only group thousands. A single separator
+    followed by exactly three digits, as in '1,234' or '1.234', could be
+    either and is rejected rather than guessed.
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+
+    text = re.sub(r"[^\d,.\-]", "", str(value))
+    sign = -1.0 if text.startswith("-") else 1.0
+    text = text[1:] if sign < 0 else text
+
+    last = max(text.rfind(","), text.rfind("."))
+    if last == -1:
+        integer, fraction, thousands = text, "", None
+    else:
+        integer, fraction = text[:last], text[last + 1:]
+        thousands = "." if text[last] == "," else ","
+        if text[last] in integer:
+            # The same separator repeats, so it can only be grouping thousands
+            integer, fraction, thousands = text, "", text[last]
+        elif thousands not in integer and len(fraction) == 3 and 1 <= len(integer) <= 3 and integer.strip("0"):
+            return float("nan")
+
+    if thousands and thousands in integer:
+        groups = integer.split(thousands)
+        if not 1 <= len(groups[0]) <= 3 or any(len(group) != 3 for group in groups[1:]):
+            return float("nan")
+        integer = "".join(groups)
+
+    if not (integer or fraction) or not DIGITS.fullmatch(integer) or not DIGITS.fullmatch(fraction):
+        return float("nan")
+    return sign * float(f"{integer or 0}.{fraction or 0}")
+
+
+price_importer = PriceListImporter()
@@ -27,11 +27,11 @@ class SocialMediaManager:
             else:
                 result = {"status": "error", "message": f"Unknown platform: {platform}"}
             
-            logger.info(f"Posted to {platform}: {content[:100]}...")
+            logger.info("Posted to %s (%d chars)", platform, len(content))
             return result
             
         except Exception as e:
-            logger.error(f"Error posting to social media: {str(e)}")
+            logger.error("Error posting to social media: %s", e)
             return {"status": "error", "message": str(e)}
     
     async def _post_to_linkedin(self, content: str) -> Dict[str, Any]:
@@ -39,7 +39,7 @@ class SocialMediaManager:
         # This is a simplified example - real implementation would use LinkedIn API
         try:
             # Simulate API call
-            logger.info(f"Simulating LinkedIn post: {content}")
+            logger.debug("Simulating LinkedIn post (%d chars)", len(content))
             
             return {
                 "status": "success",
@@ -48,14 +48,14 @@ class SocialMediaManager:
                 "post_id": "simulated_post_id_123"
             }
         except Exception as e:
-            logger.error(f"Error posting to LinkedIn: {str(e)}")
+            logger.error("Error posting to LinkedIn: %s", e)
             return {"status": "error", "message": str(e)}
     
     async def _post_to_facebook(self, content: str) -> Dict[str, Any]:
         """Post content to Facebook"""
         try:
             # Simulate API call
-            logger.info(f"Simulating Facebook post: {content}")
+            logger.debug("Simulating Facebook post (%d chars)", len(content))
             
             return {
                 "status": "success",
@@ -64,14 +64,14 @@ class SocialMediaManager:
                 "post_id": "simulated_post_id_456"
             }
         except Exception as e:
-            logger.error(f"Error posting to Facebook: {str(e)}")
+            logger.error("Error posting to Facebook: %s", e)
             return {"status": "error", "message": str(e)}
     
     async def _post_to_twitter(self, content: str) -> Dict[str, Any]:
         """Post content to Twitter"""
         try:
             # Simulate API call
-            logger.info(f"Simulating Twitter post: {content}")
+            logger.debug("Simulating Twitter post (%d chars)", len(content))
             
             return {
                 "status": "success",
@@ -80,7 +80,7 @@ class SocialMediaManager:
                 "post_id": "simulated_post_id_789"
             }
         except Exception as e:
-            logger.error(f"Error posting to Twitter: {str(e)}")
+            logger.error("Error posting to Twitter: %s", e)
             return {"status": "error", "message": str(e)}
     
     async def schedule_posts(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -0,0 +1,377 @@
+"""End-to-end load test for the CostByte backend.
+
+Boots the FastAPI app in-process with uvicorn, points OpenAI and SMTP at the
+local stubs in ``benchmarks.stubs``, and drives a weighted mix of HTTP
+requests and service calls from concurrent virtual users. Everything under
+test shares one event loop, as in production, so the report shows how long
+each service blocks that loop as well as throughput and latency percentiles.
+
+Run from ``backend/``::
+
+    python -m benchmarks.load_test --duration 60 --users 20
+    python -m benchmarks.load_test --update-baseline
+
+The run exits non-zero when any service regresses past ``--tolerance``
+against the stored baseline. If no baseline exists yet, the run is saved as
+the baseline.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import socket
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, Any, List, Callable, Awaitable
+import numpy as np
+from benchmarks.stubs import StubServers, StubProfile
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Relative weights of each operation in the traffic mix
+TRAFFIC_MIX = {
+    "http_root": 10,
+    "http_health": 25,
+    "http_dashboard": 10,
+    "content": 5,
+    "content_ideas": 20,
+    "email": 10,
+    "social": 20,
+}
+
+TOPICS = ["food cost management", "reducing kitchen waste", "supplier negotiation", "menu engineering"]
+AUDIENCES = ["hotels", "restaurants", "catering", "all"]
+TEMPLATES = ["welcome", "promotion", "general"]
+PLATFORMS = ["linkedin", "facebook", "twitter"]
+
+
+class BlockingProbe:
+    """Measures the synchronous slices of a coroutine.
+
+    Each step between two awaits runs without yielding to the event loop, so
+    the longest step is the worst stall that operation caused for everyone
+    else sharing the loop.
+    """
+
+    def __init__(self, coro):
+        self.coro = coro
+        self.slices: List[float] = []
+
+    def __await__(self):
+        iterator = self.coro.__await__()
+        value, error = None, None
+        while True:
+            started = time.perf_counter()
+            try:
+                yielded = iterator.throw(error) if error is not None else iterator.send(value)
+            except StopIteration as stop:
+                self.slices.append(time.perf_counter() - started)
+                return stop.value
+            self.slices.append(time.perf_counter() - started)
+
+            try:
+                value, error = (yield yielded), None
+            except BaseException as e:
+                value, error = None, e
+
+
+class LoopLagMonitor:
+    """Samples how late the event loop wakes a periodic timer"""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+
+    async def _run(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - started - self.interval))
+
+
+class LoadTest:
+    """Drives mixed traffic against the app and its services"""
+
+    def __init__(self, base_url: str, users: int, duration: float, mix: Dict[str, int]):
+        # Imported here so settings pick up the stub environment set in main()
+        import aiohttp
+        from app.services.content_creation import ContentCreator
+        from app.services.email_marketing import EmailMarketer
+        from app.services.social_media import SocialMediaManager
+
+        self.base_url = base_url
+        self.users = users
+        self.duration = duration
+        self.mix = mix
+        self.aiohttp = aiohttp
+
+        self.content_creator = ContentCreator()
+        self.email_marketer = EmailMarketer()
+        self.social_media_manager = SocialMediaManager()
+
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.blocking: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.lag = LoopLagMonitor()
+
+    def _operations(self, session) -> Dict[str, Callable[[], Awaitable[bool]]]:
+        """Map each traffic type to a coroutine returning whether it succeeded"""
+        async def http_get(path: str) -> bool:
+            async with session.get(f"{self.base_url}{path}") as response:
+                await response.read()
+                return response.status < 500
+
+        async def service_call(coro, succeeded: Callable[[Any], bool] = None) -> bool:
+            # The services catch their own errors, so judge success by what they returned
+            result = await coro
+            if succeeded is not None:
+                return succeeded(result)
+            if isinstance(result, dict):
+                return result.get("status") == "success"
+            return bool(result)
+
+        return {
+            "http_root": lambda: http_get("/"),
+            "http_health": lambda: http_get("/health"),
+            "http_dashboard": lambda: http_get("/dashboard/overview"),
+            "content": lambda: service_call(self.content_creator.create_content({
+                "content_type": random.choice(["blog_post", "social_media", "ad_copy"]),
+                "topic": random.choice(TOPICS),
+                "allow_duplicate": True
+            })),
+            "content_ideas": lambda: service_call(
+                self.content_creator.generate_content_ideas(random.choice(TOPICS))
+            ),
+            "email": lambda: service_call(self.email_marketer.send_campaign({
+                "audience": random.choice(AUDIENCES),
+                "template": random.choice(TEMPLATES)
+            }), lambda result: result.get("sent_count", 0) > 0),
+            "social": lambda: service_call(self.social_media_manager.post_content({
+                "platform": random.choice(PLATFORMS),
+                "content": f"Latest insights on {random.choice(TOPICS)}"
+            })),
+        }
+
+    async def _user(self, operations: Dict[str, Callable[[], Awaitable[bool]]], deadline: float):
+        """One virtual user issuing operations back to back with short think times"""
+        names = list(self.mix)
+        weights = [self.mix[name] for name in names]
+        while time.perf_counter() < deadline:
+            name = random.choices(names, weights)[0]
+            probe = BlockingProbe(operations[name]())
+            started = time.perf_counter()
+            try:
+                ok = await probe
+            except Exception as e:
+                logger.debug("%s failed: %s", name, e)
+                ok = False
+            self.latencies[name].append(time.perf_counter() - started)
+            self.blocking[name].append(max(probe.slices, default=0.0))
+            if not ok:
+                self.errors[name] += 1
+            await asyncio.sleep(random.uniform(0, 0.05))
+
+    async def run(self) -> Dict[str, Any]:
+        """Run all virtual users for the configured duration and summarise"""
+        self.lag.start()
+        started = time.perf_counter()
+        deadline = started + self.duration
+
+        async with self.aiohttp.ClientSession() as session:
+            operations = self._operations(session)
+            await asyncio.gather(*(self._user(operations, deadline) for _ in range(self.users)))
+
+        elapsed = time.perf_counter() - started
+        self.lag.stop()
+        return self.summary(elapsed)
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        """Throughput, latency percentiles, error rate and loop blocking per service"""
+        services = {}
+        for name, latencies in sorted(self.latencies.items()):
+            latencies_ms = np.asarray(latencies) * 1000
+            blocking_ms = np.asarray(self.blocking[name]) * 1000
+            services[name] = {
+                "requests": len(latencies),
+                "throughput_rps": len(latencies) / elapsed,
+                "error_rate": self.errors[name] / len(latencies),
+                "p50_ms": float(np.percentile(latencies_ms, 50)),
+                "p95_ms": float(np.percentile(latencies_ms, 95)),
+                "p99_ms": float(np.percentile(latencies_ms, 99)),
+                "blocking_p95_ms": float(np.percentile(blocking_ms, 95)),
+                "blocking_max_ms": float(blocking_ms.max()),
+            }
+
+        lag_ms = np.asarray(self.lag.samples or [0.0]) * 1000
+        return {
+            "duration_s": elapsed,
+            "users": self.users,
+            "services": services,
+            "event_loop": {
+                "lag_p99_ms": float(np.percentile(lag_ms, 99)),
+                "lag_max_ms": float(lag_ms.max()),
+            },
+        }
+
+
+def compare_to_baseline(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Describe every metric that regressed by more than tolerance"""
+    regressions = []
+    for name, base in baseline["services"].items():
+        current = results["services"].get(name)
+        if current is None:
+            continue
+
+        if current["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {current['throughput_rps']:.1f} rps < baseline {base['throughput_rps']:.1f} rps"
+            )
+        for metric in ("p95_ms", "p99_ms", "blocking_p95_ms"):
+            # Ignore sub-millisecond noise on operations that barely register
+            if current[metric] > base[metric] * (1 + tolerance) and current[metric] - base[metric] > 1.0:
+                regressions.append(f"{name}: {metric} {current[metric]:.1f} > baseline {base[metric]:.1f}")
+        if current["error_rate"] > base["error_rate"] + tolerance / 10:
+            regressions.append(
+                f"{name}: error rate {current['error_rate']:.2%} > baseline {base['error_rate']:.2%}"
+            )
+    return regressions
+
+
+def print_report(results: Dict[str, Any]):
+    """Print a table of per-service results"""
+    header = f"{'service':<16}{'reqs':>7}{'rps':>9}{'err':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'blk95':>9}{'blkmax':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, s in results["services"].items():
+        print(
+            f"{name:<16}{s['requests']:>7}{s['throughput_rps']:>9.1f}{s['error_rate']:>7.1%}"
+            f"{s['p50_ms']:>9.1f}{s['p95_ms']:>9.1f}{s['p99_ms']:>9.1f}"
+            f"{s['blocking_p95_ms']:>9.1f}{s['blocking_max_ms']:>9.1f}"
+        )
+    loop = results["event_loop"]
+    print(f"\nevent loop lag: p99 {loop['lag_p99_ms']:.1f} ms, max {loop['lag_max_ms']:.1f} ms")
+    print("latencies and blocking (blk) in ms")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _run(args, port: int) -> Dict[str, Any]:
+    """Serve the app on this loop and run the load test against it"""
+    import uvicorn
+    from app.main import app
+
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning",
+                            lifespan="on" if args.with_background else "off")
+    server = uvicorn.Server(config)
+    serve_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    try:
+        load_test = LoadTest(f"http://127.0.0.1:{port}", args.users, args.duration, TRAFFIC_MIX)
+        return await load_test.run()
+    finally:
+        server.should_exit = True
+        await serve_task
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the CostByte backend against local stubs")
+    parser.add_argument("--duration", type=float, default=30, help="seconds of traffic")
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--openai-latency", type=float, default=800, help="stub OpenAI latency (ms)")
+    parser.add_argument("--openai-error-rate", type=float, default=0.02)
+    parser.add_argument("--smtp-latency", type=float, default=50, help="stub SMTP latency (ms)")
+    parser.add_argument("--smtp-error-rate", type=float, default=0.01)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--with-background", action="store_true",
+                        help="also run the startup background loops during the test")
+    parser.add_argument("--output", help="write the full results as JSON")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+
+    stubs = StubServers(
+        openai_profile=StubProfile(args.openai_latency, args.openai_latency / 4, args.openai_error_rate),
+        smtp_profile=StubProfile(args.smtp_latency, args.smtp_latency / 4, args.smtp_error_rate),
+    ).start()
+
+    # Point every external integration at the stubs and keep state out of the tree
+    workdir = tempfile.mkdtemp(prefix="costbyte-load-")
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'costbyte.db')}",
+        "OPENAI_API_KEY": "sk-load-test",
+        "OPENAI_API_BASE": stubs.openai_base_url,
+        "SMTP_SERVER": stubs.host,
+        "SMTP_PORT": str(stubs.smtp_port),
+        "SMTP_USERNAME": "load-test",
+        "SMTP_PASSWORD": "load-test",
+        "ANALYTICS_EXPORT_DIR": os.path.join(workdir, "analytics"),
+        "CONTENT_INDEX_DIR": os.path.join(workdir, "content_index"),
+        "IDEA_POOL_PATH": os.path.join(workdir, "idea_pool.json"),
+    })
+
+    try:
+        results = asyncio.run(_run(args, _free_port()))
+    finally:
+        stubs.stop()
+
+    results["stubs"] = {
+        "openai_requests": stubs.openai.requests,
+        "smtp_attempts": stubs.smtp.attempts,
+        "smtp_messages": stubs.smtp.messages,
+    }
+
+    print_report(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    # A run whose traffic never reached the stubs measured nothing real
+    unused = [name for name, count in (("OpenAI", stubs.openai.requests), ("SMTP", stubs.smtp.attempts)) if not count]
+    if unused:
+        print(f"\nNo requests reached the {' and '.join(unused)} stub; check the client configuration")
+        return 1
+
+    if args.update_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    regressions = compare_to_baseline(results, baseline, args.tolerance)
+    if regressions:
+        print("\nRegressions against baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+
+    print("\nNo regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""Local stand-ins for the external services used by the backend.
+
+An OpenAI-compatible HTTP server and a minimal SMTP server, both with
+configurable latency and error rates. They run on their own event loop in a
+background thread so their work never shows up in the app's measurements.
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+WORDS = (
+    "food cost waste inventory supplier menu margin kitchen portion recipe "
+    "hotel restaurant catering budget forecast savings stock order price season"
+).split()
+
+
+@dataclass
+class StubProfile:
+    """Latency and failure behaviour of one stub service"""
+    latency_ms: float = 50.0
+    jitter_ms: float = 20.0
+    error_rate: float = 0.0
+
+    async def delay(self):
+        """Sleep for a randomised service time"""
+        latency = max(0.0, random.gauss(self.latency_ms, self.jitter_ms))
+        await asyncio.sleep(latency / 1000)
+
+    def fails(self) -> bool:
+        """Whether this request should fail"""
+        return random.random() < self.error_rate
+
+
+def _random_text(words: int) -> str:
+    """Plausible-looking filler so content is not deduplicated away"""
+    return " ".join(random.choice(WORDS) for _ in range(words))
+
+
+class OpenAIStub:
+    """Serves /v1/chat/completions in the OpenAI response format"""
+
+    def __init__(self, profile: StubProfile):
+        self.profile = profile
+        self.requests = 0
+        self.app = web.Application()
+        self.app.router.add_post("/v1/chat/completions", self.chat_completions)
+        self.app.router.add_post("/chat/completions", self.chat_completions)
+
+    async def chat_completions(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        self.requests += 1
+        await self.profile.delay()
+
+        if self.profile.fails():
+            return web.json_response(
+                {"error": {"message": "Rate limit reached", "type": "rate_limit_error"}}, status=429
+            )
+
+        prompt = payload["messages"][-1]["content"]
+        if "content ideas" in prompt:
+            content = "\n".join(f"{i}. {_random_text(8)}" for i in range(1, 26))
+        else:
+            content = _random_text(min(payload.get("max_tokens", 500), 600))
+
+        return web.json_response({
+            "id": f"chatcmpl-{random.getrandbits(48):x}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "gpt-4"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": len(prompt.split()), "completion_tokens": len(content.split()),
+                      "total_tokens": len(prompt.split()) + len(content.split())}
+        })
+
+
+class SMTPStub:
+    """Accepts mail over plain SMTP and discards it"""
+
+    def __init__(self, profile: StubProfile):
+        self.profile = profile
+        self.attempts = 0
+        self.messages = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        async def reply(line: str):
+            writer.write(f"{line}\r\n".encode())
+            await writer.drain()
+
+        try:
+            await reply("220 localhost stub ESMTP")
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode(errors="replace").strip().upper()
+
+                if command.startswith(("EHLO", "HELO")):
+                    await reply("250-localhost\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME")
+                elif command.startswith("AUTH"):
+                    await reply("235 2.7.0 Authentication successful")
+                elif command.startswith("STARTTLS"):
+                    await reply("454 4.7.0 TLS not available")
+                elif command.startswith(("MAIL", "RCPT", "RSET", "NOOP")):
+                    await reply("250 OK")
+                elif command == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    while (await reader.readline()) not in (b".\r\n", b".\n", b""):
+                        pass
+                    self.attempts += 1
+                    await self.profile.delay()
+                    if self.profile.fails():
+                        await reply("451 4.3.0 Temporary failure")
+                    else:
+                        self.messages += 1
+                        await reply("250 OK queued")
+                elif command == "QUIT":
+                    await reply("221 Bye")
+                    break
+                else:
+                    await reply("502 Command not implemented")
+        finally:
+            writer.close()
+
+
+class StubServers:
+    """Runs the stubs on a private event loop in a daemon thread"""
+
+    def __init__(self, openai_profile: StubProfile, smtp_profile: StubProfile, host: str = "127.0.0.1"):
+        self.host = host
+        self.openai = OpenAIStub(openai_profile)
+        self.smtp = SMTPStub(smtp_profile)
+        self.openai_port: Optional[int] = None
+        self.smtp_port: Optional[int] = None
+
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stub-servers", daemon=True)
+
+    @property
+    def openai_base_url(self) -> str:
+        return f"http://{self.host}:{self.openai_port}/v1"
+
+    def start(self) -> "StubServers":
+        """Start the stubs and wait until both are listening"""
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self):
+        """Stop the stub event loop"""
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._start_servers())
+        self._ready.set()
+        self._loop.run_forever()
+
+    async def _start_servers(self):
+        runner = web.AppRunner(self.openai.app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, self.host, 0)
+        await site.start()
+        self.openai_port = site._server.sockets[0].getsockname()[1]
+
+        smtp_server = await asyncio.start_server(self.smtp.handle, self.host, 0)
+        self.smtp_port = smtp_server.sockets[0].getsockname()[1]
+
+        logger.info("Stub servers listening: openai=%s smtp=%s", self.openai_port, self.smtp_port)
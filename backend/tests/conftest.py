@@ -0,0 +1,11 @@
+# tests/conftest.py
+import os
+import tempfile
+
+# Settings are read when app.core.config is first imported, so point the app
+# at throwaway storage before any test module imports it
+_workdir = tempfile.mkdtemp(prefix="costbyte-test-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_workdir, 'test.db')}")
+os.environ.setdefault("ANALYTICS_EXPORT_DIR", os.path.join(_workdir, "analytics"))
+os.environ.setdefault("CONTENT_INDEX_DIR", os.path.join(_workdir, "content_index"))
+os.environ.setdefault("IDEA_POOL_PATH", os.path.join(_workdir, "idea_pool.json"))
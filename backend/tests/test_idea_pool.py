@@ -0,0 +1,83 @@
+# tests/test_idea_pool.py
+import asyncio
+import json
+import time
+
+from app.services.idea_pool import IdeaPool
+
+
+class FakeIdeaSource:
+    """Returns numbered batches of ideas after a short delay"""
+
+    def __init__(self, batch_size=5, delay=0.05):
+        self.batch_size = batch_size
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self, category):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        first = (self.calls - 1) * self.batch_size
+        return [f"{category} idea {n}" for n in range(first, first + self.batch_size)]
+
+
+def _pool(tmp_path, source, **kwargs):
+    options = {"low_water": 3, "pool_size": 10, "ttl": 3600}
+    options.update(kwargs)
+    return IdeaPool(source, path=str(tmp_path / "pool.json"), **options)
+
+
+def test_cold_get_returns_after_first_batch_and_refill_continues(tmp_path):
+    async def scenario():
+        source = FakeIdeaSource()
+        pool = _pool(tmp_path, source, pool_size=8)
+
+        ideas = await pool.get("waste", 2)
+        refilling_when_served = not pool._refills["waste"].done()
+        await pool._refills["waste"]
+        return ideas, refilling_when_served, source.calls, pool.size("waste")
+
+    ideas, refilling_when_served, calls, size = asyncio.run(scenario())
+
+    assert ideas == ["waste idea 0", "waste idea 1"]
+    assert refilling_when_served
+    assert calls == 2
+    assert size == 8
+
+
+def test_cancelled_waiter_does_not_cancel_shared_refill(tmp_path):
+    async def scenario():
+        pool = _pool(tmp_path, FakeIdeaSource())
+        first = asyncio.create_task(pool.get("menus", 3))
+        second = asyncio.create_task(pool.get("menus", 3))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second, pool._refills["menus"].cancelled()
+
+    ideas, refill_cancelled = asyncio.run(scenario())
+
+    assert len(ideas) == 3
+    assert not refill_cancelled
+
+
+def test_failed_refill_releases_waiters(tmp_path):
+    async def failing(category):
+        raise RuntimeError("API down")
+
+    async def scenario():
+        return await asyncio.wait_for(_pool(tmp_path, failing).get("waste"), timeout=1)
+
+    assert asyncio.run(scenario()) == []
+
+
+def test_saved_pool_reloads_without_expired_ideas(tmp_path):
+    path = tmp_path / "pool.json"
+    now = time.time()
+    path.write_text(json.dumps({"waste": [["old idea", now - 7200], ["fresh idea", now]]}))
+
+    pool = _pool(tmp_path, FakeIdeaSource())
+    assert pool.size("waste") == 1
+
+    pool.save()
+    assert json.loads(path.read_text()) == {"waste": [["fresh idea", now]]}
+    assert [p.name for p in tmp_path.iterdir()] == ["pool.json"]
@@ -0,0 +1,50 @@
+# tests/test_leader_election.py
+import asyncio
+
+from app.core import leader_election
+from app.core.config import settings
+from app.core.leader_election import LeaderElector, PostgresAdvisoryLock
+
+
+def test_one_process_leads_and_another_takes_over(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "LEADER_LOCK_FILE", str(tmp_path / "leader.lock"))
+
+    async def scenario():
+        started = []
+
+        def loops_for(name):
+            def start_loops():
+                started.append(name)
+                return [asyncio.create_task(asyncio.sleep(3600))]
+            return start_loops
+
+        first, second = LeaderElector(loops_for("a"), 0.02), LeaderElector(loops_for("b"), 0.02)
+        first.start()
+        await asyncio.sleep(0.05)
+        second.start()
+        await asyncio.sleep(0.1)
+        leaders = (first.is_leader, second.is_leader)
+
+        await first.stop()
+        await asyncio.sleep(0.1)
+        takeover = second.is_leader
+        await second.stop()
+        return leaders, takeover, started
+
+    leaders, takeover, started = asyncio.run(scenario())
+
+    assert leaders == (True, False)
+    assert takeover
+    assert started == ["a", "b"]
+
+
+def test_advisory_lock_keepalives_follow_retry_interval(monkeypatch):
+    engines = []
+    monkeypatch.setattr(leader_election, "create_engine", lambda url, **kwargs: engines.append(kwargs))
+
+    lock = PostgresAdvisoryLock(1, retry_interval=2)
+
+    connect_args = engines[0]["connect_args"]
+    assert (connect_args["keepalives_idle"], connect_args["keepalives_interval"], connect_args["keepalives_count"]) == (4, 2, 3)
+    assert connect_args["tcp_user_timeout"] == 10000
+    assert (lock.keepalives_idle, lock.keepalives_interval, lock.keepalives_count) == (4, 2, 3)
@@ -0,0 +1,63 @@
+# tests/test_logging_config.py
+import logging
+import queue
+
+from app.core import logging_config
+from app.core.logging_config import DeferredQueueHandler, SamplingFilter
+
+
+def _record(msg="value %s", args=(), level=logging.INFO, lineno=10):
+    return logging.LogRecord("costbyte.test", level, "/app/module.py", lineno, msg, args, None)
+
+
+def test_sampling_filter_accepts_unhashable_messages():
+    sampling = SamplingFilter(rate=0, burst=1, sample_rate=0)
+
+    assert sampling.filter(_record(msg={"unhashable": [1]}))
+    assert not sampling.filter(_record(msg=["another", "message"]))
+
+
+def test_sampling_filter_limits_each_call_site_separately():
+    sampling = SamplingFilter(rate=0, burst=2, sample_rate=0)
+
+    passed = [sampling.filter(_record(lineno=10)) for _ in range(5)]
+    other_site = sampling.filter(_record(lineno=11))
+    warning = sampling.filter(_record(lineno=10, level=logging.WARNING))
+
+    assert passed == [True, True, False, False, False]
+    assert other_site and warning
+
+
+def test_flush_reports_counts_of_quiet_call_sites():
+    reported = []
+    sampling = SamplingFilter(rate=0, burst=1, sample_rate=0, report=reported.append)
+    for _ in range(4):
+        sampling.filter(_record(lineno=42))
+
+    sampling.flush()
+    sampling.flush()
+
+    assert [(r.lineno, r.suppressed, r.getMessage()) for r in reported] == [
+        (42, 3, "Suppressed 3 records from this call site")
+    ]
+
+
+def test_prepare_renders_mutable_arguments_before_queueing():
+    handler = DeferredQueueHandler(queue.SimpleQueue())
+    settings = {"k": 1}
+    mutable = handler.prepare(_record(args=(settings,)))
+    settings["k"] = 2
+
+    scalar = handler.prepare(_record(msg="%s of %d", args=("part", 3)))
+
+    assert (mutable.msg, mutable.args) == ("value {'k': 1}", None)
+    assert (scalar.msg, scalar.args) == ("%s of %d", ("part", 3))
+
+
+def test_shutdown_restores_direct_logging():
+    logging_config.setup_logging()
+    logging_config.shutdown_logging()
+
+    handlers = logging.getLogger().handlers
+    assert len(handlers) == 1
+    assert type(handlers[0]) is logging.StreamHandler
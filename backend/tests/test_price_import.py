@@ -0,0 +1,158 @@
+# tests/test_price_import.py
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+
+from app.db.session import engine
+from app.db.models.supplier_price import SupplierPrice
+from app.services.price_import import PriceListImporter, _number
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("12.50", 12.5),
+    ("12,50", 12.5),
+    ("R 1 234,50", 1234.5),
+    ("1,234.50", 1234.5),
+    ("1.234,50", 1234.5),
+    ("1.234.567,89", 1234567.89),
+    ("1,234,567", 1234567.0),
+    ("0,125", 0.125),
+    ("1234.567", 1234.567),
+    ("-3,5", -3.5),
+    ("1500", 1500.0),
+])
+def test_number_uses_last_separator_as_decimal(text, expected):
+    parsed = _number(pd.Series([text]), pd.RangeIndex(1))
+    assert parsed[0] == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("text", ["1,234", "1.234", "1,23,456", "1.2.3", "", "n/a", "1-2"])
+def test_number_rejects_ambiguous_or_malformed_values(text):
+    parsed = _number(pd.Series([text]), pd.RangeIndex(1))
+    assert pd.isna(parsed[0])
+
+
+def test_number_keeps_numeric_cells():
+    parsed = _number(pd.Series([1.234, 12], dtype=object), pd.RangeIndex(2))
+    assert parsed.tolist() == [1.234, 12.0]
+
+
+def _stored_prices(supplier_id):
+    with engine.connect() as connection:
+        return dict(connection.execute(
+            SupplierPrice.__table__.select()
+            .with_only_columns(SupplierPrice.product_code, SupplierPrice.price)
+            .where(SupplierPrice.supplier_id == supplier_id)
+        ).all())
+
+
+def _sheet(rows):
+    frame = pd.DataFrame(rows, columns=["SKU", "Description", "Unit Price", "Valid From"])
+    return frame.astype(str)
+
+
+def test_dates_parse_iso_first_and_fall_back_to_day_first():
+    importer = PriceListImporter()
+    chunk = _sheet([
+        ["A1", "Flour", "10.00", "2024-03-04"],
+        ["A2", "Sugar", "11.00", "04/03/2024"],
+        ["A3", "Salt", "12.00", "2024-03-04T08:30:00"],
+        ["A4", "Rice", "13.00", "not a date"],
+    ])
+
+    frame, rejected = importer._normalise(chunk, "sup-1", None, "sheet.csv")
+
+    assert frame.set_index("product_code")["effective_date"].to_dict() == {
+        "A1": date(2024, 3, 4),
+        "A2": date(2024, 3, 4),
+        "A3": date(2024, 3, 4),
+    }
+    assert rejected["invalid_date"] == 1
+
+
+def test_ambiguous_prices_are_rejected_not_stored():
+    importer = PriceListImporter()
+    chunk = _sheet([["B1", "Oil", "1,234", "2024-01-01"], ["B2", "Vinegar", "1.234,50", "2024-01-01"]])
+
+    frame, rejected = importer._normalise(chunk, "sup-1", None, "sheet.csv")
+
+    assert frame["product_code"].tolist() == ["B2"]
+    assert frame["price"].tolist() == [1234.5]
+    assert rejected["invalid_price"] == 1
+
+
+def test_reimport_only_upserts_changed_rows(tmp_path):
+    SupplierPrice.__table__.create(engine, checkfirst=True)
+    importer = PriceListImporter()
+    path = str(tmp_path / "prices.csv")
+    rows = [["C1", "Butter", "85,00", "2024-02-01"], ["C2", "Cream", "42,50", "2024-02-01"]]
+
+    _sheet(rows).to_csv(path, sep=";", index=False)
+    first = importer.import_file(path, "sup-2")
+    again = importer.import_file(path, "sup-2")
+
+    rows[1][2] = "44,00"
+    _sheet(rows).to_csv(path, sep=";", index=False)
+    changed = importer.import_file(path, "sup-2")
+
+    assert (first["rows_upserted"], again["rows_upserted"], changed["rows_upserted"]) == (2, 0, 1)
+    assert _stored_prices("sup-2") == {"C1": 85.0, "C2": 44.0}
+
+
+def test_xlsx_numeric_codes_match_the_same_sheet_as_csv(tmp_path):
+    from openpyxl import Workbook
+
+    SupplierPrice.__table__.create(engine, checkfirst=True)
+    importer = PriceListImporter(chunk_size=2)
+
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["Item Code", "Description", "Price", "Valid From"])
+    sheet.append([10001, "Flour", 10.5, datetime(2024, 5, 1)])
+    # A blank row makes the first chunk's code column partly empty
+    sheet.append([None, None, None, None])
+    sheet.append([10003, "Salt", 2.0, datetime(2024, 5, 1)])
+    # No extension: the format is detected from the content
+    xlsx_path = str(tmp_path / "upload")
+    workbook.save(xlsx_path)
+
+    first = importer.import_file(xlsx_path, "sup-3")
+    again = importer.import_file(xlsx_path, "sup-3")
+
+    csv_path = str(tmp_path / "prices.csv")
+    _sheet([["10001", "Flour", "10.50", "2024-05-01"], ["10003", "Salt", "2.00", "2024-05-01"]]).to_csv(
+        csv_path, index=False
+    )
+    importer.import_file(csv_path, "sup-3")
+
+    assert (first["status"], first["rows_upserted"], again["rows_upserted"]) == ("success", 2, 0)
+    # The CSV updates the same two rows rather than adding "10001" next to "10001.0"
+    with engine.connect() as connection:
+        codes = connection.execute(
+            SupplierPrice.__table__.select()
+            .with_only_columns(SupplierPrice.product_code)
+            .where(SupplierPrice.supplier_id == "sup-3")
+        ).scalars().all()
+    assert sorted(codes) == ["10001", "10003"]
+
+
+def test_sheet_without_price_column_is_an_error(tmp_path):
+    path = str(tmp_path / "prices.csv")
+    pd.DataFrame({"SKU": ["D1"], "Description": ["Eggs"], "Amount": ["5"]}).to_csv(path, index=False)
+
+    report = PriceListImporter().import_file(path, "sup-4")
+
+    assert report["status"] == "error"
+    assert "price" in report["message"]
+
+
+def test_upload_without_filename_is_imported(tmp_path):
+    SupplierPrice.__table__.create(engine, checkfirst=True)
+    data = tmp_path / "upload.csv"
+    _sheet([["E1", "Milk", "19,99", "2024-06-01"]]).to_csv(data, sep=";", index=False)
+
+    with open(data, "rb") as f:
+        report = PriceListImporter().import_upload(f, None, "sup-5")
+
+    assert (report["status"], report["rows_upserted"], report["source_file"]) == ("success", 1, "upload")
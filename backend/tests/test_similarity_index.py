@@ -0,0 +1,78 @@
+# tests/test_similarity_index.py
+import os
+
+import pytest
+
+from app.helpers.similarity_index import SimilarityIndex, RECORD_HEADER
+
+BASE = "Ten practical ways restaurants can cut food waste in the kitchen without hurting quality"
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    return str(tmp_path / "index")
+
+
+def test_near_duplicates_match_and_unrelated_text_does_not(index_path):
+    index = SimilarityIndex(index_path, threshold=0.8)
+    item_id = index.add(BASE, "first")
+
+    assert [i for i, _ in index.query(BASE)] == [item_id]
+    assert index.is_duplicate(BASE.upper() + "!")
+    assert not index.is_duplicate("How hotels should negotiate supplier contracts for fresh produce each season")
+
+
+def test_threshold_decides_whether_a_one_word_edit_is_a_duplicate(tmp_path):
+    text = (
+        f"{BASE}: track every discarded plate, portion proteins by weight, rotate stock first in first out, "
+        "repurpose trimmings into staff meals, and review supplier deliveries against the menu forecast each week"
+    )
+    edited = text.replace("staff meals", "family meals")
+
+    strict = SimilarityIndex(str(tmp_path / "strict"), threshold=0.95)
+    strict.add(text)
+    default = SimilarityIndex(str(tmp_path / "default"), threshold=0.8)
+    default.add(text)
+
+    assert not strict.is_duplicate(edited)
+    assert default.is_duplicate(edited)
+
+
+def test_texts_without_words_match_nothing(index_path):
+    index = SimilarityIndex(index_path)
+    index.add("", "empty")
+    index.add("!!!", "punctuation")
+
+    assert index.query("!!!") == []
+    assert index.query("") == []
+    assert index.size == 2
+
+
+def test_round_trip_after_reload(index_path):
+    index = SimilarityIndex(index_path)
+    ids = [index.add(f"{BASE} number {n} edition", f"label-{n}") for n in range(5)]
+    index.add("Seasonal menu planning for beach resorts", "menu")
+
+    reloaded = SimilarityIndex(index_path)
+
+    assert reloaded.size == 6
+    assert reloaded.labels == index.labels
+    assert reloaded.query("Seasonal menu planning for beach resorts")[0][0] == 5
+    assert reloaded.label(ids[3]) == "label-3"
+    assert reloaded.add("Another unrelated note on bar stock control", "bar") == 6
+
+
+def test_torn_record_is_skipped_on_load_and_cut_off_by_the_next_writer(index_path):
+    index = SimilarityIndex(index_path)
+    index.add(BASE, "kept")
+    complete_size = os.path.getsize(f"{index_path}.idx")
+    with open(f"{index_path}.idx", "ab") as f:
+        f.write(RECORD_HEADER.pack(10) + b"\x01\x02")
+
+    reader = SimilarityIndex(index_path)
+    assert reader.size == 1
+    # Loading leaves the file alone; only adding repairs it
+    assert os.path.getsize(f"{index_path}.idx") > complete_size
+
+    reader.add("Seasonal menu planning for beach resorts", "added")
+    assert SimilarityIndex(index_path).labels == ["kept", "added"]